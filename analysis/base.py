@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
+from core.cancellation import TimeBudget
 
 class AnalysisModule(ABC):
-    def __init__(self, data_container):
+    version = 1
+    inputs = ()
+    
+    def __init__(self, data_container, budget=None):
         self.data_container = data_container
+        self.budget = budget or TimeBudget()
+        # Set when the budget cut extraction short; partial results are shown but not cached
+        self.partial = False
     
     @abstractmethod
     def extract_properties(self):
@@ -12,6 +19,11 @@ class AnalysisModule(ABC):
     def get_module_name(self):
         pass
     
+    @classmethod
+    def estimate_cost(cls, data_container):
+        # Rough seconds to extract from this container; modules over the budget wait for a click
+        return 0.0
+    
     @classmethod
     @abstractmethod
     def get_supported_containers(cls):
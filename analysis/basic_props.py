@@ -1,9 +1,12 @@
-import numpy as np
 from analysis.base import AnalysisModule
 
 class BasicPropertiesModule(AnalysisModule):
+    version = 2
+    inputs = ('stats', 'channel_minmax')
+    
     def extract_properties(self):
         image = self.data_container.original
+        stats = self.data_container.get_intermediate('stats')
         
         properties = [
             ("Image Name", self.data_container.filepath.name, False),
@@ -14,11 +17,19 @@ class BasicPropertiesModule(AnalysisModule):
             ("Data Type", str(image.dtype), False),
             ("Min Value", self.data_container.data_min, False),
             ("Max Value", self.data_container.data_max, False),
-            ("Has NaN", np.isnan(image).any(), False),
-            ("Has Inf", np.isinf(image).any(), False),
+            ("Has NaN", stats.has_nan, False),
+            ("Has Inf", stats.has_inf, False),
             ("File Size", f"{self.data_container.filepath.stat().st_size} bytes", False)
         ]
         
+        source = self.data_container.source
+        if source is not None:
+            full_height, full_width = self.data_container.get_full_shape()
+            properties[4:4] = [
+                ("Full Resolution", f"{full_width}x{full_height}", False),
+                ("Pyramid Level", f"{self.data_container.level} of {len(source.levels) - 1}", False)
+            ]
+        
         return properties
     
     def get_module_name(self):
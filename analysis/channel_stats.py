@@ -1,21 +1,19 @@
-import cv2
-import numpy as np
 from analysis.base import AnalysisModule
 
 class ChannelStatsModule(AnalysisModule):
+    version = 2
+    inputs = ('stats',)
+    
     def extract_properties(self):
         properties = []
+        stats = self.data_container.get_intermediate('stats')
         
         for i, channel_name in enumerate(self.data_container.channel_names):
-            channel = self.data_container.get_channel(i)
-            
-            min_val, max_val, _, _ = cv2.minMaxLoc(channel)
-            mean_val = np.mean(channel)
-            
             properties.extend([
-                (f"{channel_name} Min", int(min_val), False),
-                (f"{channel_name} Max", int(max_val), False),
-                (f"{channel_name} Mean", f"{mean_val:.2f}", False)
+                (f"{channel_name} Min", stats.min[i].item(), False),
+                (f"{channel_name} Max", stats.max[i].item(), False),
+                (f"{channel_name} Mean", f"{stats.mean[i]:.2f}", False),
+                (f"{channel_name} Std", f"{stats.std[i]:.2f}", False)
             ])
         
         return properties
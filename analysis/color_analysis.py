@@ -1,36 +1,52 @@
-import numpy as np
 from analysis.base import AnalysisModule
+from core.settings import Settings
+from utils.dominant_colors import find_dominant_colors
 
 class ColorAnalysisModule(AnalysisModule):
+    version = 3
+    inputs = ('unique_colors',)
+    
     def extract_properties(self):
         properties = []
+        unique_colors = self.data_container.get_intermediate('unique_colors')
         
         if self.data_container.channels == 1:
-            unique_colors = len(np.unique(self.data_container.original))
-            properties.append(("Unique Values", unique_colors, False))
+            properties.append(("Unique Values", len(unique_colors), False))
         else:
-            reshaped = self.data_container.original.reshape(-1, self.data_container.channels)
-            unique_colors = len(np.unique(reshaped, axis=0))
-            properties.append(("Unique Colors", unique_colors, False))
+            properties.append(("Unique Colors", len(unique_colors), False))
             
-            dominant_colors = self._get_dominant_colors(reshaped)
-            properties.append(("Dominant Colors", dominant_colors, True))
+            dominant_colors, finished = self._get_dominant_colors(unique_colors)
+            if not finished:
+                # Cut short by the module's deadline; never cached, so a later visit can finish it
+                self.partial = True
+            properties.append(("Dominant Colors (partial)" if self.partial else "Dominant Colors", dominant_colors, True))
         
         return properties
     
-    def _get_dominant_colors(self, reshaped_image, k=5):
-        try:
-            from sklearn.cluster import KMeans
-            
-            kmeans = KMeans(n_clusters=min(k, len(np.unique(reshaped_image, axis=0))), 
-                          random_state=42, n_init=10)
-            kmeans.fit(reshaped_image)
-            
-            colors = kmeans.cluster_centers_.astype(int)
-            return [tuple(color) for color in colors]
-        except ImportError:
-            unique_vals = np.unique(reshaped_image, axis=0)
-            return [tuple(color) for color in unique_vals[:5]]
+    def _get_dominant_colors(self, unique_colors, k=5):
+        settings = Settings()
+        self.budget.check()
+        return find_dominant_colors(
+            unique_colors.values, unique_colors.counts, k,
+            max_samples=settings.get('dominant_colors_max_samples', 10000),
+            n_init=settings.get('dominant_colors_n_init', 4),
+            max_iter=settings.get('dominant_colors_max_iter', 100),
+            budget=self.budget
+        )
+    
+    @classmethod
+    def estimate_cost(cls, data_container):
+        cost = 0.0
+        if not data_container.has_intermediate('unique_colors'):
+            # Packed integer keys are counted in one pass; anything else falls back to a sort
+            small_integer = data_container.original.dtype.kind in 'uib' and data_container.original.dtype.itemsize <= 2
+            cost = data_container.original.size * (1e-8 if small_integer else 1.5e-7)
+        if data_container.channels > 1:
+            # A fixed number of restarts, each over at most max_samples weighted colours
+            settings = Settings()
+            colors, _ = data_container.estimate_unique_counts()
+            cost += min(colors, settings.get('dominant_colors_max_samples', 10000)) * settings.get('dominant_colors_n_init', 4) * 5e-6
+        return cost
     
     def get_module_name(self):
         return "Color Analysis"
@@ -1,20 +1,18 @@
-import numpy as np
 from analysis.base import AnalysisModule
 
 class PCLChannelStatsModule(AnalysisModule):
+    inputs = ('channel_minmax',)
+    
     def extract_properties(self):
         if not self.data_container.has_colors:
             return []
         
         properties = []
+        min_vals, max_vals = self.data_container.get_intermediate('channel_minmax')
         for i, channel_name in enumerate(self.data_container.channel_names):
-            channel = self.data_container.get_color_channel(i)
-            min_val = np.min(channel)
-            max_val = np.max(channel)
-            
             properties.extend([
-                (f"{channel_name} Min", int(min_val), False),
-                (f"{channel_name} Max", int(max_val), False)
+                (f"{channel_name} Min", int(min_vals[i]), False),
+                (f"{channel_name} Max", int(max_vals[i]), False)
             ])
         
         return properties
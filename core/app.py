@@ -1,16 +1,20 @@
-from PyQt6.QtWidgets import QMainWindow, QSplitter, QFileDialog, QMenu
+import os
+from PyQt6.QtWidgets import QMainWindow, QSplitter, QFileDialog, QMenu, QProgressBar
 from PyQt6.QtCore import Qt, QTimer
-from file_loaders import get_loader, get_all_extensions
-from file_loaders.npz_loader import NPZLoader
-from core.module_manager import ModuleManager
+from file_loaders import get_all_extensions
+from file_loaders.sequence import FileSequenceSource, find_sequence
+from file_loaders.base import FileLoader
+from core.module_manager import ModuleManager, PROPERTIES, VISUALIZATIONS
+from core.load_pipeline import LoadPipeline
+from core.frame_navigator import FrameNavigator
 from core.file_watcher import FileWatcher
-from core.file_access import FileAccessManager
 from core.ssh_manager import SSHConnectionPool
 from core.remote_monitor import RemoteFileMonitor
 from core.settings import Settings
 from core.keybind_manager import KeybindManager
 from gui.grid_display import GridDisplay
 from gui.analysis_table import AnalysisTable
+from gui.frame_bar import FrameBar
 from gui.remote_dialog import RemoteImageDialog
 from gui.widget_utils import cursor_signals
 
@@ -24,7 +28,11 @@ class ImageAnalyzerApp(QMainWindow):
         self.move((screen.width() - 1200) // 2, (screen.height() - 800) // 2)
         
         self.data_container = None
+        self.frame_navigator = None
+        self.sequence = None
+        self.module_run = None
         self.module_manager = ModuleManager()
+        self.load_pipeline = LoadPipeline(self.module_manager)
         self.file_watcher = FileWatcher(self._reload_current_file)
         self.settings = Settings()
         self.keybind_manager = KeybindManager(self, debug=True)
@@ -39,10 +47,36 @@ class ImageAnalyzerApp(QMainWindow):
         self.splitter.addWidget(self.analysis_table)
         self.splitter.setSizes([640, 160])
         cursor_signals.cursor_info.connect(self.analysis_table.set_cursor_info)
+        self.analysis_table.compute_requested.connect(lambda order: self._compute_module(PROPERTIES, order))
+        self.grid_display.compute_requested.connect(lambda order: self._compute_module(VISUALIZATIONS, order))
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, len(LoadPipeline.STAGES))
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        self.load_pipeline.progress.connect(self._show_progress)
+        self.load_pipeline.loaded.connect(self._on_loaded)
+        self.load_pipeline.failed.connect(self._on_load_failed)
+        self.load_pipeline.stopped.connect(self._on_load_stopped)
+        
+        self.frame_bar = FrameBar()
+        self.frame_bar.hide()
+        self.frame_bar.index_changed.connect(self._request_frame)
+        self.addToolBar(Qt.ToolBarArea.BottomToolBarArea, self.frame_bar)
+        self._pending_frame = None
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._show_pending_frame)
+        self.frame_bar.play_toggled.connect(self._set_playing)
+        self._playback_timer = QTimer(self)
+        self._playback_timer.setInterval(int(1000 / self.settings.get('playback_fps', 10)))
+        self._playback_timer.timeout.connect(self._advance_playback)
         
         file_menu = self.menuBar().addMenu("File")
         file_menu.addAction(self.keybind_manager.create_action("open_image", "Open Image", self._open_image))
         file_menu.addAction(self.keybind_manager.create_action("open_remote_image", "Open Remote Image", self._open_remote_image))
+        file_menu.addAction(self.keybind_manager.create_action("open_sequence", "Open Sequence", self._open_sequence))
         file_menu.addSeparator()
         file_menu.addAction("Exit", self.close)
 
@@ -54,6 +88,14 @@ class ImageAnalyzerApp(QMainWindow):
         anim_menu.addAction("Save Animation...", self._anim_save)
         anim_menu.addAction("Load Animation...", self._anim_load)
 
+        frame_menu = self.menuBar().addMenu("Frames")
+        frame_menu.addAction(self.keybind_manager.create_action("next_frame", "Next Frame", lambda: self._step_frame(1)))
+        frame_menu.addAction(self.keybind_manager.create_action("previous_frame", "Previous Frame", lambda: self._step_frame(-1)))
+        frame_menu.addAction(self.keybind_manager.create_action("toggle_playback", "Play/Pause Frames", lambda: self._set_playing(not self._playback_timer.isActive())))
+
+        self.level_menu = self.menuBar().addMenu("Pyramid Level")
+        self.level_menu.menuAction().setVisible(False)
+
         self.setAcceptDrops(True)
     
     def keyPressEvent(self, event):
@@ -67,17 +109,26 @@ class ImageAnalyzerApp(QMainWindow):
     def dropEvent(self, event):
         files = [url.toLocalFile() for url in event.mimeData().urls()]
         if files:
-            NPZLoader._close_existing_dialog()
-            QTimer.singleShot(100, lambda: self.load_image(files[0]))
+            FileLoader.close_active_dialog()
+            if os.path.isdir(files[0]):
+                QTimer.singleShot(100, lambda: self.load_sequence(files[0]))
+            else:
+                QTimer.singleShot(100, lambda: self.load_image(files[0]))
     
     def _open_image(self):
-        NPZLoader._close_existing_dialog()
+        FileLoader.close_active_dialog()
         extensions = get_all_extensions()
         ext_pattern = " ".join(f"*{ext}" for ext in extensions)
         filename, _ = QFileDialog.getOpenFileName(self, "Select Image", "", f"All supported files ({ext_pattern})")
         if filename:
             self.load_image(filename)
     
+    def _open_sequence(self):
+        FileLoader.close_active_dialog()
+        directory = QFileDialog.getExistingDirectory(self, "Select Sequence Directory")
+        if directory:
+            self.load_sequence(directory)
+    
     def _open_remote_image(self):
         dialog = RemoteImageDialog()
         if dialog.exec() == RemoteImageDialog.DialogCode.Accepted:
@@ -94,34 +145,184 @@ class ImageAnalyzerApp(QMainWindow):
             
             self.load_image((remote_identifier, connection_info))
     
-    def load_image(self, filepath):
-        resolved_path = FileAccessManager.resolve_path(filepath)
-        
-        loader = get_loader(resolved_path)
-        container = loader.create_container(resolved_path)
-        if container is None:
+    def load_image(self, filepath, sequence=None):
+        self._set_playing(False)
+        self._cancel_modules()
+        self.sequence = sequence
+        self.file_watcher.stop_watching()
+        self.load_pipeline.start(filepath)
+    
+    def load_sequence(self, pattern):
+        paths = find_sequence(pattern)
+        if not paths:
+            self.statusBar().showMessage(f"No supported files found in {pattern}", 10000)
             return
+        self.load_image(paths[0], paths)
+    
+    def _on_loaded(self, job):
+        if job.reload_target:
+            job.reload_target.update_from(job.container)
+        else:
+            self.data_container = job.container
         
-        self.file_watcher.stop_watching()
-        self.data_container = container
-        self._analyze_image()
-        self.file_watcher.start_watching(self.data_container.filepath)
+        self._update_level_menu()
+        self._update_frame_navigator(job)
+        self._display(self.data_container, name=job.name)
+        
+        if not job.reload_target:
+            self.file_watcher.start_watching(self.data_container.filepath)
+            self.raise_()
+            self.activateWindow()
+            self.setFocus()
+    
+    def _on_load_failed(self, job, message):
+        self._hide_progress()
+        self.statusBar().showMessage(f"Failed to load {job.name}: {message}", 10000)
+        self._resume_watching(job)
+    
+    def _on_load_stopped(self, job):
+        self._hide_progress()
+        self._resume_watching(job)
+    
+    def _resume_watching(self, job):
+        if not job.reload_target and self.data_container and self.load_pipeline.job is None:
+            self.file_watcher.start_watching(self.data_container.filepath)
+    
+    def _display(self, container, properties=None, name=None, prepared=None):
+        self._cancel_modules()
+        self.grid_display.clear()
+        self.analysis_table.clear()
         
-        self.raise_()
-        self.activateWindow()
-        self.setFocus()
+        run = self.module_run = self.module_manager.run(container, properties, prepared)
+        run.properties_ready.connect(self.analysis_table.add_properties)
+        run.visualizations_ready.connect(self.grid_display.add_visualizations)
+        run.module_skipped.connect(self._show_placeholder)
+        run.module_failed.connect(self._show_failure)
+        run.finished.connect(lambda: self._on_modules_finished(run))
+        if name:
+            run.progress.connect(lambda done, total: self._show_progress(f"Analyzing {name}... ({done}/{total})", 2))
+            run.finished.connect(lambda: self._hide_progress() if self.load_pipeline.job is None else None)
+        run.start()
+    
+    def _cancel_modules(self):
+        # Whatever is still running belongs to a container that is about to be replaced
+        if self.module_run:
+            self.module_run.cancel()
+    
+    def _show_placeholder(self, kind, order, module_name, cost):
+        view = self.analysis_table if kind == PROPERTIES else self.grid_display
+        view.add_placeholder(order, module_name, cost)
+    
+    def _show_failure(self, kind, order, module_name, error):
+        view = self.analysis_table if kind == PROPERTIES else self.grid_display
+        view.add_failure(order, module_name, error)
     
-    def _analyze_image(self):
-        if not self.data_container:
+    def _compute_module(self, kind, order):
+        if self.module_run:
+            self.module_run.compute(kind, order)
+    
+    def _on_modules_finished(self, run):
+        # Frames are cached without properties or prepared visualizations until they have been shown once
+        navigator = self.frame_navigator
+        entry = navigator.cache.get(navigator.index) if navigator else None
+        if entry is not None and entry[0] is run.container:
+            properties = run.properties if entry[1] is None else entry[1]
+            navigator.cache.put(navigator.index, (run.container, properties, run.prepared))
+    
+    def _show_progress(self, message, stage):
+        self.statusBar().showMessage(message)
+        self.progress_bar.setValue(stage)
+        self.progress_bar.show()
+    
+    def _hide_progress(self):
+        self.statusBar().clearMessage()
+        self.progress_bar.hide()
+    
+    def _update_level_menu(self):
+        self.level_menu.clear()
+        source = getattr(self.data_container, 'source', None)
+        self.level_menu.menuAction().setVisible(source is not None)
+        if source is None:
+            return
+        
+        for level, (height, width) in enumerate(source.levels):
+            action = self.level_menu.addAction(f"Level {level} ({width}x{height})", lambda l=level: self._set_level(l))
+            action.setCheckable(True)
+            action.setChecked(level == self.data_container.level)
+    
+    def _update_frame_navigator(self, job):
+        if job.reload_target and self.sequence and self.frame_navigator:
+            self.frame_navigator.cache.put(self.frame_navigator.index, (self.data_container, None, None))
+            return
+        
+        self._set_playing(False)
+        if self.frame_navigator:
+            self.frame_navigator.close()
+            self.frame_navigator = None
+        
+        if self.sequence:
+            source = FileSequenceSource(self.sequence, self.data_container.loader)
+            options = {'ahead': self.settings.get('sequence_read_ahead', 8), 'behind': 2,
+                       'workers': self.settings.get('sequence_workers', 2)}
+        else:
+            source = self.data_container.loader.get_frame_source(self.data_container.filepath)
+            options = {}
+        self.frame_bar.setVisible(source is not None)
+        if source is None:
             return
         
-        self.grid_display.update_grid(self.module_manager.get_visualizations(self.data_container))
-        self.analysis_table.update_properties(self.module_manager.get_properties(self.data_container))
+        self.frame_navigator = FrameNavigator(self.module_manager, source, source.start_index, self.data_container, **options)
+        self.frame_navigator.frame_ready.connect(self._show_frame)
+        self.frame_navigator.frame_failed.connect(self._on_frame_failed)
+        self.frame_bar.set_range(len(source), source.start_index)
+        self.frame_bar.set_index(source.start_index, source.label(source.start_index))
+    
+    def _step_frame(self, delta):
+        if self.frame_navigator:
+            self.frame_navigator.step(delta)
+    
+    def _set_playing(self, playing):
+        playing = playing and self.frame_navigator is not None
+        if playing:
+            self._playback_timer.start()
+        else:
+            self._playback_timer.stop()
+        self.frame_bar.set_playing(playing)
+    
+    def _advance_playback(self):
+        navigator = self.frame_navigator
+        if navigator is None or navigator.index >= len(navigator) - 1:
+            self._set_playing(False)
+        elif navigator.is_ready(navigator.index + 1):
+            navigator.step(1)
+    
+    def _request_frame(self, index):
+        self._pending_frame = index
+        self._frame_timer.start(0)
+    
+    def _show_pending_frame(self):
+        if self.frame_navigator and self._pending_frame is not None:
+            self.frame_navigator.show(self._pending_frame)
+        self._pending_frame = None
+    
+    def _show_frame(self, index, container, properties, prepared):
+        source = self.frame_navigator.source
+        self.data_container = container
+        self._display(container, properties, prepared=prepared)
+        self.frame_bar.set_index(index, source.label(index))
+        self.file_watcher.start_watching(container.filepath)
+    
+    def _on_frame_failed(self, index, message):
+        self.statusBar().showMessage(f"Failed to load frame {index + 1}: {message}", 10000)
+    
+    def _set_level(self, level):
+        self.data_container.loader.stored_params['level'] = level
+        self._reload_current_file()
     
     def _reload_current_file(self):
         if self.data_container:
-            self.data_container.reload()
-            self._analyze_image()
+            self._cancel_modules()
+            self.load_pipeline.reload(self.data_container)
     
     def _get_active_animation(self):
         from PyQt6.QtWidgets import QWidget
@@ -162,6 +363,11 @@ class ImageAnalyzerApp(QMainWindow):
                 anim.load(path)
 
     def closeEvent(self, event):
+        self._set_playing(False)
+        self.load_pipeline.cancel()
+        self._cancel_modules()
+        if self.frame_navigator:
+            self.frame_navigator.close()
         self.file_watcher.stop_watching()
         SSHConnectionPool.cleanup()
         RemoteFileMonitor.cleanup()
@@ -0,0 +1,22 @@
+import hashlib
+from pathlib import Path
+
+HASH_SAMPLE_BYTES = 1 << 16
+
+def get_cache_dir(subdir=None):
+    cache_dir = Path.home() / '.image-analyzer-cache'
+    if subdir:
+        cache_dir = cache_dir / subdir
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+def file_identity(filepath):
+    # Size and mtime catch ordinary edits; the sampled hash catches rewrites that preserve both
+    filepath = Path(filepath).resolve()
+    stat = filepath.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for offset in sorted({0, max(0, stat.st_size // 2 - HASH_SAMPLE_BYTES // 2), max(0, stat.st_size - HASH_SAMPLE_BYTES)}):
+            f.seek(offset)
+            digest.update(f.read(HASH_SAMPLE_BYTES))
+    return (str(filepath), stat.st_size, stat.st_mtime_ns, digest.hexdigest())
@@ -0,0 +1,41 @@
+import threading
+import time
+
+class OperationCancelled(Exception):
+    pass
+
+class CancellationToken:
+    def __init__(self, parent=None):
+        # A child token is also cancelled whenever its parent is
+        self._event = threading.Event()
+        self.parent = parent
+    
+    def cancel(self):
+        self._event.set()
+    
+    @property
+    def cancelled(self):
+        return self._event.is_set() or (self.parent is not None and self.parent.cancelled)
+    
+    def check(self):
+        if self.cancelled:
+            raise OperationCancelled()
+
+class TimeBudget:
+    def __init__(self, seconds=None, token=None):
+        self.seconds = seconds
+        self.token = token or CancellationToken()
+        self.deadline = None if seconds is None else time.perf_counter() + seconds
+    
+    def check(self):
+        self.token.check()
+    
+    def should_stop(self):
+        # Cancellation unwinds the work entirely; an expired deadline only asks for the best result so far
+        self.token.check()
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+    
+    def remaining(self):
+        if self.deadline is None:
+            return float('inf')
+        return max(0.0, self.deadline - time.perf_counter())
\ No newline at end of file
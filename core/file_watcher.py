@@ -1,3 +1,4 @@
+from pathlib import Path
 from PyQt6.QtCore import QTimer, QMetaObject, Qt, QObject, pyqtSlot
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
@@ -16,15 +17,23 @@ class FileWatcher(QObject):
         super().__init__()
         self.callback = callback
         self.observer = None
+        self.handler = None
         self.timer = QTimer(self)
         self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.callback)
     
     def start_watching(self, filepath):
+        if self.observer and Path(self.handler.filepath).parent == filepath.parent:
+            # Same directory (e.g. stepping through a sequence): just retarget the handler
+            self.timer.stop()
+            self.handler.filepath = str(filepath)
+            return
+        
         self.stop_watching()
         
         self.observer = Observer()
-        self.observer.schedule(FileChangeHandler(self, filepath), str(filepath.parent), recursive=False)
+        self.handler = FileChangeHandler(self, filepath)
+        self.observer.schedule(self.handler, str(filepath.parent), recursive=False)
         self.observer.start()
     
     def stop_watching(self):
@@ -32,6 +41,7 @@ class FileWatcher(QObject):
             self.observer.stop()
             self.observer.join()
             self.observer = None
+        self.handler = None
         self.timer.stop()
     
     @pyqtSlot()
@@ -0,0 +1,89 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from core.cancellation import CancellationToken
+from core.prefetch import PrefetchCache
+from core.settings import Settings
+
+class FrameNavigator(QObject):
+    frame_ready = pyqtSignal(int, object, object, object)
+    frame_failed = pyqtSignal(int, str)
+
+    _ready = pyqtSignal(object, object, object)
+
+    def __init__(self, module_manager, source, index, container=None, properties=None, ahead=None, behind=None, workers=1):
+        super().__init__()
+        self.module_manager = module_manager
+        self.source = source
+        self.index = index
+        self._closed = False
+        # Read-ahead prepares visualizations for frames not yet shown; closing stops that work
+        self.token = CancellationToken()
+
+        settings = Settings()
+        radius = settings.get('frame_prefetch', 4)
+        self.ahead = radius if ahead is None else ahead
+        self.behind = radius if behind is None else behind
+        capacity = max(settings.get('frame_cache_size', 32), self.ahead + self.behind + 1)
+        self.cache = PrefetchCache(self._produce, capacity, self._ready.emit, workers)
+        self._ready.connect(self._on_ready)
+
+        if container is not None:
+            self.cache.put(index, (container, properties, None))
+        self.cache.request(self._window(index))
+
+    def __len__(self):
+        return len(self.source)
+
+    def show(self, index):
+        index = max(0, min(index, len(self.source) - 1))
+        self.index = index
+        entry = self.cache.get(index)
+        window = self._window(index)
+        self.cache.request(window)
+        self._release_prepared(set(window))
+        if entry is not None:
+            self.frame_ready.emit(index, *entry)
+
+    def is_ready(self, index):
+        return self.cache.get(index) is not None
+
+    def step(self, delta):
+        self.show(self.index + delta)
+
+    def close(self):
+        self._closed = True
+        self.token.cancel()
+        self.cache.close()
+
+    def _window(self, index):
+        keys = [index]
+        for offset in range(1, max(self.ahead, self.behind) + 1):
+            if offset <= self.ahead and index + offset < len(self.source):
+                keys.append(index + offset)
+            if offset <= self.behind and index - offset >= 0:
+                keys.append(index - offset)
+        return keys
+
+    def _release_prepared(self, window):
+        # Prepared visualizations are full-size images; only frames about to be shown keep theirs
+        def release(index, entry):
+            if index in window or entry[2] is None:
+                return entry
+            return entry[0], entry[1], None
+        self.cache.update(release)
+
+    def _produce(self, index):
+        container = self.source.load(index)
+        properties = self.module_manager.get_properties(container, self.token)
+        return container, properties, self.module_manager.prepare_visualizations(container, self.token)
+
+    def _on_ready(self, index, entry, error):
+        if self._closed:
+            return
+        if index != self.index:
+            # A frame that was already being read when the window moved past it
+            self._release_prepared(set(self._window(self.index)))
+            return
+        if error is not None:
+            self.frame_failed.emit(index, error)
+        else:
+            self.frame_ready.emit(index, *entry)
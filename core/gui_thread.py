@@ -0,0 +1,30 @@
+import threading
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+class GuiInvoker(QObject):
+    invoke = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.invoke.connect(self._run, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def _run(self, call):
+        call()
+
+_invoker = GuiInvoker()
+
+def run_in_gui_thread(func):
+    if threading.current_thread() is threading.main_thread():
+        return func()
+
+    outcome = {}
+    def call():
+        try:
+            outcome['result'] = func()
+        except Exception as e:
+            outcome['error'] = e
+
+    _invoker.invoke.emit(call)
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
@@ -0,0 +1,61 @@
+import threading
+
+# Intermediates and the work waiting on them jump ahead of modules that have not started yet
+PRIORITY = -1
+
+class IntermediateScheduler:
+    def __init__(self, container, submit, token):
+        self.container = container
+        self.submit = submit
+        self.token = token
+        self._lock = threading.Lock()
+        self._scheduled = set()
+        self._failed = set()
+        self._waiting = []
+
+    def when_ready(self, names, task, *args):
+        # Runs the task right here when its inputs exist, otherwise on a worker once the last one lands
+        with self._lock:
+            missing = self._missing(names)
+            if missing:
+                self._waiting.append((missing, task, args))
+                for name in missing:
+                    self._schedule(name)
+                return
+        task(*args)
+
+    def _missing(self, names):
+        return {name for name in names if not self.container.has_intermediate(name) and name not in self._failed}
+
+    def _schedule(self, name):
+        if name in self._scheduled:
+            return
+        self._scheduled.add(name)
+        requires = self._missing(self.container.intermediate_requirements(name))
+        if requires:
+            self._waiting.append((requires, self._compute, (name,)))
+            for required in requires:
+                self._schedule(required)
+        else:
+            self.submit(self._compute, name, priority=PRIORITY)
+
+    def _compute(self, name):
+        if self.token.cancelled:
+            return
+        try:
+            self.container.get_intermediate(name)
+            failed = False
+        except Exception:
+            # Whatever reads it hits the same error again and reports it with its own context
+            failed = True
+
+        with self._lock:
+            if failed:
+                self._failed.add(name)
+            for missing, _, _ in self._waiting:
+                missing.discard(name)
+            ready = [waiter for waiter in self._waiting if not waiter[0]]
+            self._waiting = [waiter for waiter in self._waiting if waiter[0]]
+
+        for _, task, args in ready:
+            self.submit(task, *args, priority=PRIORITY)
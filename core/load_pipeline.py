@@ -0,0 +1,137 @@
+import threading
+import traceback
+from pathlib import Path
+from PyQt6.QtCore import QObject, pyqtSignal
+from core.cancellation import CancellationToken, OperationCancelled
+from core.file_access import FileAccessManager
+from file_loaders import get_loader
+from file_loaders.base import FileLoader
+
+class LoadJob:
+    def __init__(self, filepath, reload_target=None):
+        self.filepath = filepath
+        self.reload_target = reload_target
+        self.token = CancellationToken()
+        self.loader = reload_target.loader if reload_target else None
+        self.resolved_path = str(reload_target.filepath) if reload_target else None
+        self.container = None
+
+    @property
+    def name(self):
+        path = self.filepath[0] if isinstance(self.filepath, tuple) else self.filepath
+        return Path(str(path)).name
+
+class LoadPipeline(QObject):
+    STAGES = ["Resolving", "Decoding", "Analyzing"]
+
+    progress = pyqtSignal(str, int)
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(object, str)
+    stopped = pyqtSignal(object)
+
+    _resolved = pyqtSignal(object)
+    _decoded = pyqtSignal(object)
+    _error = pyqtSignal(object, str)
+
+    def __init__(self, module_manager):
+        super().__init__()
+        self.module_manager = module_manager
+        self.job = None
+        self._resolved.connect(self._prepare)
+        self._decoded.connect(self._finish)
+        self._error.connect(self._fail)
+
+    def start(self, filepath):
+        self._cancel_current()
+        self.job = LoadJob(filepath)
+        self._run(self.job, self._resolve, self._resolved)
+
+    def reload(self, container):
+        self._cancel_current()
+        self.job = LoadJob(container.filepath, container)
+        self._run(self.job, self._decode, self._decoded)
+
+    def cancel(self):
+        job = self.job
+        self._cancel_current()
+        if job:
+            self.stopped.emit(job)
+
+    def _cancel_current(self):
+        FileLoader.close_active_dialog()
+        if self.job:
+            self.job.token.cancel()
+            self.job = None
+
+    def _run(self, job, work, done_signal):
+        def target():
+            try:
+                work(job)
+                job.token.check()
+                done_signal.emit(job)
+            except OperationCancelled:
+                self._discard(job)
+            except Exception as e:
+                traceback.print_exc()
+                self._error.emit(job, str(e))
+
+        threading.Thread(target=target, daemon=True).start()
+
+    def _report(self, job, stage):
+        job.token.check()
+        self.progress.emit(f"{self.STAGES[stage]} {job.name}...", stage)
+
+    def _resolve(self, job):
+        self._report(job, 0)
+        job.resolved_path = FileAccessManager.resolve_path(job.filepath)
+
+    def _prepare(self, job):
+        if job is not self.job:
+            return
+
+        try:
+            job.loader = get_loader(job.resolved_path)
+            prepared = job.loader.prepare(job.resolved_path)
+        except Exception as e:
+            traceback.print_exc()
+            self._fail(job, str(e))
+            return
+
+        if job is not self.job:
+            return
+        if not prepared:
+            self.job = None
+            self.stopped.emit(job)
+            return
+        self._run(job, self._decode, self._decoded)
+
+    def _decode(self, job):
+        self._report(job, 1)
+        if job.reload_target:
+            job.container = job.loader.reload_container(job.resolved_path)
+        else:
+            job.container = job.loader.create_container(job.resolved_path)
+
+    def _finish(self, job):
+        if job is not self.job:
+            self._discard(job)
+            return
+        self.job = None
+        if job.container is None:
+            self.stopped.emit(job)
+            return
+        self.progress.emit(f"{self.STAGES[2]} {job.name}...", 2)
+        self.loaded.emit(job)
+
+    def _discard(self, job):
+        # A superseded decode would otherwise leave a tiled TIFF's file handle to the garbage collector
+        source = getattr(job.container, 'source', None)
+        if source is not None and source is not getattr(job.reload_target, 'source', None):
+            source.close()
+        job.container = None
+
+    def _fail(self, job, message):
+        if job is not self.job:
+            return
+        self.job = None
+        self.failed.emit(job, message)
@@ -1,55 +1,277 @@
-from visualization.original import OriginalImageModule
-from visualization.golden_ratio_hsv import GoldenRatioHSVModule
-from visualization.channel_heatmap import PerChannelHeatmapModule
-from visualization.pcl_rgb import PCLRGBModule
-from visualization.pcl_channel_heatmap import PCLChannelHeatmapModule
-from visualization.depth_pointcloud import DepthPointCloudModule
-from visualization.pcl_unique_hsv import PCLUniqueHSVModule
-
-from analysis.basic_props import BasicPropertiesModule
-from analysis.channel_stats import ChannelStatsModule
-from analysis.exif_data import EXIFDataModule
-from analysis.color_analysis import ColorAnalysisModule
-from analysis.npz_data import NPZAnalysisModule
-from analysis.pcl_props import PCLBasicPropertiesModule
-from analysis.pcl_channel_stats import PCLChannelStatsModule
+import threading
+import traceback
+from PyQt6.QtCore import QObject, pyqtSignal
+from core.cancellation import CancellationToken, OperationCancelled, TimeBudget
+from core.intermediates import IntermediateScheduler
+from core.registry import ModuleEntry
+from core.result_cache import AnalysisResultCache
+from core.settings import Settings
+from core.worker_pool import WorkerPool
+
+PROPERTIES = 'properties'
+VISUALIZATIONS = 'visualizations'
+
+class ModuleRun(QObject):
+    properties_ready = pyqtSignal(int, object)
+    visualizations_ready = pyqtSignal(int, object)
+    module_skipped = pyqtSignal(str, int, str, float)
+    module_failed = pyqtSignal(str, int, str, str)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+    _computed = pyqtSignal(int, object)
+    _prepared = pyqtSignal(int, object, object)
+    _skipped = pyqtSignal(str, int, str, float)
+    _failed = pyqtSignal(str, int, str)
+
+    def __init__(self, manager, container, properties=None, prepared=None):
+        super().__init__()
+        self.manager = manager
+        self.container = container
+        self.properties = properties
+        # Visualization order -> prepare() output, from an earlier visit or kept for the next one
+        self.prepared = dict(prepared or {})
+        self.token = CancellationToken()
+        self.scheduler = IntermediateScheduler(container, manager.pool.submit, self.token)
+        self.done = 0
+        self.total = 0
+        self._entries = {PROPERTIES: [], VISUALIZATIONS: []}
+        self._pending = set()
+        self._forced = set()
+        self._skipped_properties = False
+        self._results = {}
+        self._container_key = None
+        self._key_lock = threading.Lock()
+        self._key_ready = False
+        self._computed.connect(self._on_computed)
+        self._prepared.connect(self._on_prepared)
+        self._skipped.connect(self._on_skipped)
+        self._failed.connect(self._on_failed)
+
+    def start(self):
+        if self.properties is None:
+            self._entries[PROPERTIES] = [entry for entry in self.manager.analysis_modules if entry.supports(self.container)]
+        self._entries[VISUALIZATIONS] = [entry for entry in self.manager.visualization_modules if entry.supports(self.container)]
+        self._pending = {(kind, order) for kind, entries in self._entries.items() for order in range(len(entries))}
+        self.total = len(self._pending)
+
+        if self.properties is not None:
+            self.properties_ready.emit(0, self.properties)
+        for kind, order in sorted(self._pending):
+            self._submit(kind, order)
+
+        if not self.total:
+            self._finish()
+
+    def compute(self, kind, order):
+        # Runs a module that was skipped for being over budget
+        self._forced.add((kind, order))
+        self._submit(kind, order)
+
+    def cancel(self):
+        self.token.cancel()
+
+    def _submit(self, kind, order):
+        work = self._compute if kind == PROPERTIES else self._prepare
+        self.manager.pool.submit(self._run, kind, order, work, self._entries[kind][order])
+
+    def _run(self, kind, order, work, *args):
+        try:
+            self.token.check()
+            work(order, *args)
+        except OperationCancelled:
+            pass
+        except Exception as e:
+            traceback.print_exc()
+            self._failed.emit(kind, order, str(e))
+
+    def _within_budget(self, kind, order, module_class):
+        if (kind, order) in self._forced:
+            return True
+        cost = module_class.estimate_cost(self.container)
+        if cost <= self.manager.cost_budget:
+            return True
+        self._skipped.emit(kind, order, module_class(self.container).get_module_name(), cost)
+        return False
+
+    def _compute(self, order, entry):
+        module_class = entry.load()
+        key = self.manager.result_key(module_class, self._get_container_key())
+        result = self.manager.result_cache.get(key) if key else None
+        if result is not None:
+            self._computed.emit(order, result)
+        elif self._within_budget(PROPERTIES, order, module_class):
+            self.scheduler.when_ready(module_class.inputs, self._run, PROPERTIES, order, self._extract, module_class, key)
+
+    def _extract(self, order, module_class, key):
+        module = module_class(self.container, self._budget())
+        result = module.extract_properties()
+        if module.partial:
+            # Kept out of both caches so the next visit computes it in full
+            self._skipped_properties = True
+        elif key:
+            self.manager.result_cache.put(key, result)
+        self._computed.emit(order, result)
+
+    def _prepare(self, order, entry):
+        module_class = entry.load()
+        if order in self.prepared:
+            self._prepared.emit(order, module_class(self.container, self._budget()), self.prepared[order])
+        elif self._within_budget(VISUALIZATIONS, order, module_class):
+            self.scheduler.when_ready(module_class.inputs, self._run, VISUALIZATIONS, order, self._build_data, module_class)
+
+    def _build_data(self, order, module_class):
+        # Widgets can only be created on the GUI thread, so only the compute half runs here
+        module = module_class(self.container, self._budget())
+        self.prepared[order] = module.prepare()
+        self._prepared.emit(order, module, self.prepared[order])
+
+    def _budget(self):
+        return TimeBudget(self.manager.time_budget, self.token)
+
+    def _get_container_key(self):
+        with self._key_lock:
+            if not self._key_ready:
+                self._container_key = self.manager.result_cache.container_key(self.container)
+                self._key_ready = True
+        return self._container_key
+
+    def _on_computed(self, order, properties):
+        if self.token.cancelled:
+            return
+        self._results[order] = properties
+        self.properties_ready.emit(order, properties)
+        self._complete(PROPERTIES, order)
+
+    def _on_prepared(self, order, module, prepared):
+        if self.token.cancelled:
+            return
+        try:
+            self.visualizations_ready.emit(order, module.build(prepared))
+        except Exception as e:
+            traceback.print_exc()
+            self._on_failed(VISUALIZATIONS, order, str(e))
+            return
+        self._complete(VISUALIZATIONS, order)
+
+    def _on_skipped(self, kind, order, name, cost):
+        if self.token.cancelled:
+            return
+        if kind == PROPERTIES:
+            self._skipped_properties = True
+        self.module_skipped.emit(kind, order, name, cost)
+        self._complete(kind, order)
+
+    def _on_failed(self, kind, order, message):
+        if self.token.cancelled:
+            return
+        if kind == PROPERTIES:
+            # Like a skipped module, a failed one leaves the properties incomplete
+            self._skipped_properties = True
+        self._forced.discard((kind, order))
+        self.module_failed.emit(kind, order, self._module_name(kind, order), message)
+        self._complete(kind, order)
+
+    def _module_name(self, kind, order):
+        entry = self._entries[kind][order]
+        try:
+            return entry.load()(self.container).get_module_name()
+        except Exception:
+            # The module may have failed to import at all
+            return entry.class_name
+
+    def _complete(self, kind, order):
+        # Modules computed on demand after being skipped were already counted
+        if self.token.cancelled or (kind, order) not in self._pending:
+            return
+        self._pending.discard((kind, order))
+        self.done += 1
+        self.progress.emit(self.done, self.total)
+        if not self._pending:
+            self._finish()
+
+    def _finish(self):
+        # Properties missing a skipped module are not worth keeping for the next visit
+        if self.properties is None and not self._skipped_properties:
+            self.properties = [prop for order in sorted(self._results) for prop in self._results[order]]
+        self.finished.emit()
 
 class ModuleManager:
     def __init__(self):
         self.visualization_modules = [
-            OriginalImageModule,
-            GoldenRatioHSVModule,
-            PerChannelHeatmapModule,
-            DepthPointCloudModule,
-            PCLRGBModule,
-            PCLChannelHeatmapModule,
-            PCLUniqueHSVModule
+            ModuleEntry('visualization.original', 'OriginalImageModule', ['ImageContainer']),
+            ModuleEntry('visualization.golden_ratio_hsv', 'GoldenRatioHSVModule', ['ImageContainer']),
+            ModuleEntry('visualization.channel_heatmap', 'PerChannelHeatmapModule', ['ImageContainer']),
+            ModuleEntry('visualization.depth_pointcloud', 'DepthPointCloudModule', ['ImageContainer']),
+            ModuleEntry('visualization.pcl_rgb', 'PCLRGBModule', ['PCLContainer']),
+            ModuleEntry('visualization.pcl_channel_heatmap', 'PCLChannelHeatmapModule', ['PCLContainer']),
+            ModuleEntry('visualization.pcl_unique_hsv', 'PCLUniqueHSVModule', ['PCLContainer'])
         ]
-        
+
+        self.result_cache = AnalysisResultCache()
+        settings = Settings()
+        self.pool = WorkerPool.get_pool()
+        self.cost_budget = settings.get('module_cost_budget', 2.0)
+        self.time_budget = settings.get('module_time_budget', 10.0)
+
         self.analysis_modules = [
-            BasicPropertiesModule,
-            ChannelStatsModule,
-            EXIFDataModule,
-            ColorAnalysisModule,
-            NPZAnalysisModule,
-            PCLBasicPropertiesModule,
-            PCLChannelStatsModule
+            ModuleEntry('analysis.basic_props', 'BasicPropertiesModule', ['ImageContainer']),
+            ModuleEntry('analysis.channel_stats', 'ChannelStatsModule', ['ImageContainer']),
+            ModuleEntry('analysis.exif_data', 'EXIFDataModule', ['ImageContainer']),
+            ModuleEntry('analysis.color_analysis', 'ColorAnalysisModule', ['ImageContainer']),
+            ModuleEntry('analysis.npz_data', 'NPZAnalysisModule', ['ImageContainer']),
+            ModuleEntry('analysis.pcl_props', 'PCLBasicPropertiesModule', ['PCLContainer']),
+            ModuleEntry('analysis.pcl_channel_stats', 'PCLChannelStatsModule', ['PCLContainer'])
         ]
-    
-    def get_visualizations(self, container):
-        visualizations = []
-        
-        for module_class in self.visualization_modules:
-            if type(container) in module_class.get_supported_containers():
-                module = module_class(container)
-                visualizations.extend(module.generate_visualizations())
-        return visualizations
-    
-    def get_properties(self, container):
+
+    def run(self, container, properties=None, prepared=None):
+        return ModuleRun(self, container, properties, prepared)
+
+    def prepare_visualizations(self, container, token=None):
+        # The worker-thread half of every visualization within the cost budget, by the order a run uses
+        prepared = {}
+        entries = [entry for entry in self.visualization_modules if entry.supports(container)]
+        for order, entry in enumerate(entries):
+            module_class = entry.load()
+            if module_class.estimate_cost(container) > self.cost_budget:
+                continue
+            try:
+                prepared[order] = module_class(container, TimeBudget(self.time_budget, token)).prepare()
+            except OperationCancelled:
+                break
+            except Exception:
+                # Left for the run that shows this container to retry and report
+                pass
+        return prepared
+
+    def get_properties(self, container, token=None):
+        # None when cancelled or cut short, so the run that shows this container extracts them in full
         properties = []
-        
-        for module_class in self.analysis_modules:
-            if type(container) in module_class.get_supported_containers():
-                module = module_class(container)
-                properties.extend(module.extract_properties())
-        return properties
\ No newline at end of file
+        container_key = self.result_cache.container_key(container)
+
+        for entry in self.analysis_modules:
+            if entry.supports(container):
+                try:
+                    result = self.extract_properties(entry, container, container_key, token)
+                except OperationCancelled:
+                    return None
+                if result is None:
+                    return None
+                properties.extend(result)
+        return properties
+
+    def result_key(self, module_class, container_key):
+        return self.result_cache.module_key(container_key, module_class) if container_key else None
+
+    def extract_properties(self, entry, container, container_key, token=None):
+        module_class = entry.load()
+        key = self.result_key(module_class, container_key)
+        result = self.result_cache.get(key) if key else None
+        if result is None:
+            module = module_class(container, TimeBudget(self.time_budget, token))
+            result = module.extract_properties()
+            if module.partial:
+                return None
+            if key:
+                self.result_cache.put(key, result)
+        return result
\ No newline at end of file
@@ -0,0 +1,80 @@
+import threading
+import traceback
+from collections import OrderedDict
+
+class PrefetchCache:
+    def __init__(self, produce, capacity, on_ready=None, workers=1):
+        self.produce = produce
+        self.capacity = max(1, capacity)
+        self.on_ready = on_ready
+        self._entries = OrderedDict()
+        self._queue = []
+        self._in_progress = set()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        for _ in range(max(1, workers)):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def get(self, key):
+        with self._condition:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._condition:
+            self._store(key, value)
+
+    def update(self, transform):
+        # Rewrites stored values in place, without touching their recency
+        with self._condition:
+            for key, value in list(self._entries.items()):
+                self._entries[key] = transform(key, value)
+
+    def request(self, keys):
+        # Keys are in priority order; anything not requested again is dropped from the queue
+        with self._condition:
+            self._queue = [key for key in keys if key not in self._entries and key not in self._in_progress]
+            self._condition.notify_all()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._queue = []
+            self._entries.clear()
+            self._condition.notify_all()
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                key = self._queue.pop(0)
+                self._in_progress.add(key)
+
+            value, error = None, None
+            try:
+                value = self.produce(key)
+            except Exception as e:
+                traceback.print_exc()
+                error = str(e)
+
+            with self._condition:
+                self._in_progress.discard(key)
+                if self._closed:
+                    return
+                if error is None:
+                    self._store(key, value)
+
+            if self.on_ready:
+                self.on_ready(key, value, error)
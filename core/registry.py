@@ -0,0 +1,30 @@
+import importlib
+import threading
+
+class LazyClass:
+    _lock = threading.Lock()
+
+    def __init__(self, module_path, class_name):
+        self.module_path = module_path
+        self.class_name = class_name
+        self._cls = None
+
+    def load(self):
+        if self._cls is None:
+            with LazyClass._lock:
+                if self._cls is None:
+                    self._cls = getattr(importlib.import_module(self.module_path), self.class_name)
+        return self._cls
+
+class ModuleEntry(LazyClass):
+    def __init__(self, module_path, class_name, containers):
+        super().__init__(module_path, class_name)
+        self.containers = containers
+
+    def supports(self, container):
+        return type(container).__name__ in self.containers
+
+class LoaderEntry(LazyClass):
+    def __init__(self, module_path, class_name, extensions):
+        super().__init__(module_path, class_name)
+        self.extensions = extensions
@@ -3,6 +3,7 @@ import hashlib
 import threading
 from pathlib import Path
 from core.ssh_manager import SSHConnectionPool
+from core.cache_utils import get_cache_dir
 
 class RemoteFileMonitor:
     _monitors = {}
@@ -14,8 +15,7 @@ class RemoteFileMonitor:
         if connection_info:
             cls._stored_connections[remote_identifier] = connection_info
         
-        cache_dir = Path.home() / '.image-analyzer-cache'
-        cache_dir.mkdir(exist_ok=True)
+        cache_dir = get_cache_dir()
         
         if remote_identifier.startswith('ssh://'):
             remote_identifier = remote_identifier[6:]
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from core.cache_utils import get_cache_dir, file_identity
+from core.settings import Settings
+
+# Reads only move access times, so they are committed with the next write or at most this often, in seconds
+ACCESS_FLUSH_INTERVAL = 30.0
+
+class AnalysisResultCache:
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or get_cache_dir() / 'analysis.sqlite'
+        self.max_bytes = max_bytes or Settings().get('analysis_cache_bytes', 256 << 20)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)")
+        self._db.commit()
+        self._accessed = {}
+        self._flushed = time.monotonic()
+
+    def container_key(self, container):
+        try:
+            identity = file_identity(container.filepath)
+        except OSError:
+            return None
+        data = container.original if hasattr(container, 'original') else container.points
+        params = json.dumps(container.loader.stored_params or {}, sort_keys=True, default=str)
+        return repr((identity, params, type(container).__name__, tuple(data.shape), str(data.dtype)))
+
+    def module_key(self, container_key, module_class):
+        text = repr((container_key, module_class.__module__, module_class.__name__, module_class.version))
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if time.monotonic() - self._flushed >= ACCESS_FLUSH_INTERVAL:
+                self._flush_accessed()
+                self._db.commit()
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, blob, len(blob), time.time()))
+            self._accessed.pop(key, None)
+            # Eviction orders by access time, so pending reads are written first
+            self._flush_accessed()
+            self._evict()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+            self._accessed = {}
+
+    def _flush_accessed(self):
+        self._db.executemany("UPDATE results SET accessed = ? WHERE key = ?",
+                             [(accessed, key) for key, accessed in self._accessed.items()])
+        self._accessed = {}
+        self._flushed = time.monotonic()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
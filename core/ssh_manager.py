@@ -3,6 +3,7 @@ import time
 import threading
 import paramiko
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QPushButton, QLabel, QHBoxLayout
+from core.gui_thread import run_in_gui_thread
 
 class UserPasswordDialog(QDialog):
     def __init__(self, username, hostname):
@@ -134,14 +135,14 @@ class SSHConnectionPool:
     
     @classmethod
     def _get_user_password(cls, username, hostname):
-        dialog = UserPasswordDialog(username, hostname)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            return dialog.get_password()
-        return None
+        return run_in_gui_thread(lambda: cls._exec_password_dialog(UserPasswordDialog(username, hostname)))
     
     @classmethod
     def _get_key_password(cls, key_path):
-        dialog = KeyPasswordDialog(key_path)
+        return run_in_gui_thread(lambda: cls._exec_password_dialog(KeyPasswordDialog(key_path)))
+    
+    @classmethod
+    def _exec_password_dialog(cls, dialog):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             return dialog.get_password()
         return None
@@ -0,0 +1,38 @@
+import itertools
+import os
+import queue
+import threading
+import traceback
+from core.settings import Settings
+
+class WorkerPool:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, workers):
+        # Daemon threads, unlike concurrent.futures, so a slow module never holds up exit
+        self._tasks = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        for _ in range(max(1, workers)):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    @classmethod
+    def get_pool(cls):
+        # Modules and the background work they leave behind share one set of workers
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(Settings().get('module_workers', os.cpu_count() or 1))
+            return cls._instance
+
+    def submit(self, task, *args, priority=0):
+        # Lower priorities run first; equal priorities run in submission order
+        self._tasks.put((priority, next(self._sequence), task, args))
+
+    def _work(self):
+        while True:
+            _, _, task, args = self._tasks.get()
+            try:
+                task(*args)
+            except Exception:
+                # One failed task must not cost the shared pool a worker for the rest of the session
+                traceback.print_exc()
@@ -1,10 +1,38 @@
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
 
 class BaseContainer(ABC):
+    # name -> (producer method, names of the intermediates it reads)
+    INTERMEDIATES = {}
+
     def __init__(self, filepath):
         self.filepath = Path(filepath)
+        self._intermediates = {}
+        self._intermediate_locks = {}
+        self._intermediate_lock = threading.Lock()
     
-    @abstractmethod
     def reload(self):
-        pass
\ No newline at end of file
+        self.update_from(self.loader.reload_container(str(self.filepath)))
+    
+    @abstractmethod
+    def update_from(self, container):
+        pass
+
+    def get_intermediate(self, name):
+        # update_from swaps in the new container's store, so hold on to this version's
+        values, locks = self._intermediates, self._intermediate_locks
+        with self._intermediate_lock:
+            lock = locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in values:
+                method_name, _ = self.INTERMEDIATES[name]
+                values[name] = getattr(self, method_name)()
+        return values[name]
+
+    def has_intermediate(self, name):
+        return name in self._intermediates
+
+    @classmethod
+    def intermediate_requirements(cls, name):
+        return cls.INTERMEDIATES[name][1]
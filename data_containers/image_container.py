@@ -1,33 +1,142 @@
 import cv2
 import numpy as np
 from data_containers.base_container import BaseContainer
+from utils.depth_projection import project_depth_to_pointcloud
+from utils.image_stats import ImageStats
+from utils.region_graph import region_adjacency
+from utils.unique_colors import UniqueColors
 
 class ImageContainer(BaseContainer):
-    def __init__(self, filepath, data, loader_data, loader):
+    INTERMEDIATES = {
+        'stats': ('_compute_stats', ()),
+        'channel_minmax': ('_compute_channel_minmax', ('stats',)),
+        'unique_colors': ('_compute_unique_colors', ()),
+        'channel_unique': ('_compute_channel_unique', ('unique_colors',)),
+        'channel_planes': ('_compute_channel_planes', ()),
+        'display_image': ('_compute_display_image', ()),
+        'projected_points': ('_compute_projected_points', ()),
+    }
+
+    def __init__(self, filepath, data, loader_data, loader, source=None):
         super().__init__(filepath)
         self.original = data
         self.loader_data = loader_data
         self.loader = loader
+        self.source = source
+        self.level = loader_data.get('level', 0)
+        self._update_metadata()
+
+    def update_from(self, container):
+        if self.source is not None and self.source is not container.source:
+            self.source.close()
+        vars(self).update(vars(container))
+
+    def get_full_shape(self):
+        if self.source is None:
+            return self.original.shape[:2]
+        return self.source.levels[0]
+
+    def get_stats(self):
+        return self.get_intermediate('stats')
+
+    def get_unique_colors(self):
+        return self.get_intermediate('unique_colors')
+
+    @property
+    def data_min(self):
+        return np.min(self.get_intermediate('channel_minmax')[0])
+
+    @property
+    def data_max(self):
+        return np.max(self.get_intermediate('channel_minmax')[1])
+
+    def estimate_unique_counts(self, samples=65536):
+        # Exact once unique colors exist; otherwise counted on a few evenly spaced rows, which
+        # touches a handful of pages of a memory-mapped image rather than all of them
+        if self.has_intermediate('unique_colors'):
+            values = self.get_intermediate('unique_colors').values
+        else:
+            height, width = self.original.shape[:2]
+            rows = self.original[::max(1, height // max(1, samples // width))]
+            values = UniqueColors(rows.reshape(-1, self.channels)).values
+        return len(values), [len(np.unique(values[:, i])) for i in range(self.channels)]
+
+    def estimate_boundaries(self, samples=1 << 17, band=8):
+        # (touching pixel pairs, distinct touching label pairs) for the global map and each channel's map,
+        # counted on a few evenly spaced bands of rows and scaled up to the whole image
+        height, width = self.original.shape[:2]
+        step = max(band, height // max(1, samples // (width * band)))
+        rows = np.stack([self.original[start:start + band] for start in range(0, max(1, height - band + 1), step)])
+        rows = rows.reshape(rows.shape[:3] + (self.channels,))
+
+        # Colors are numbered by folding in one channel's numbering at a time
+        maps = [np.unique(rows[..., i], return_inverse=True)[1].reshape(rows.shape[:3]) for i in range(self.channels)]
+        colors = maps[0]
+        for channel in maps[1:]:
+            colors = np.unique(colors * (int(channel.max()) + 1) + channel, return_inverse=True)[1].reshape(rows.shape[:3])
+
+        estimates = []
+        for label_map in [colors] + (maps if self.channels > 1 else []):
+            pairs = edges = 0
+            for index in label_map:
+                edges_i, _, lengths = region_adjacency(index, int(index.max()) + 1)
+                pairs += int(lengths.sum())
+                edges += len(edges_i)
+            scale = height * width / label_map.size
+            estimates.append((pairs * scale, edges * scale))
+        return estimates[0], estimates[1:] or estimates
+
+    def _compute_stats(self):
+        return ImageStats(self.original)
+
+    def _compute_channel_minmax(self):
+        stats = self.get_intermediate('stats')
+        return stats.min, stats.max
+
+    def _compute_unique_colors(self):
+        return UniqueColors(self.original.reshape(-1, self.channels))
+
+    def _compute_channel_unique(self):
+        # Every value a channel takes appears in some unique color, so this never rescans the image
+        values = self.get_intermediate('unique_colors').values
+        return [np.unique(values[:, i]) for i in range(self.channels)]
+
+    def _compute_channel_planes(self):
+        # One interleaved -> planar pass; each plane is then a contiguous (H, W) slice
+        if self.channels == 1:
+            return np.ascontiguousarray(self.original)[None]
+        return np.ascontiguousarray(np.moveaxis(self.original, 2, 0))
+
+    def _compute_display_image(self):
+        image = self.original.copy()
         
+        if image.dtype != np.uint8:
+            if np.issubdtype(image.dtype, np.integer):
+                dtype_info = np.iinfo(image.dtype)
+                image = ((image.astype(np.float64) - dtype_info.min) * 255 / (dtype_info.max - dtype_info.min)).astype(np.uint8)
+            else:
+                image = cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+        
+        if self.channels == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        elif self.channels == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2RGBA)
+        elif self.channels > 4:
+            image = cv2.cvtColor(image[:, :, :3], cv2.COLOR_BGR2RGB)
+        return image
+
+    def _compute_projected_points(self):
+        return [project_depth_to_pointcloud(self.get_channel_view(i)) for i in range(self.channels)]
+
+    def _update_metadata(self):
         self.channels = self._detect_channels()
         self.channel_names = self._get_channel_names()
-        self.data_min = np.min(self.original)
-        self.data_max = np.max(self.original)
-    
-    def reload(self):
-        container = self.loader.reload_container(str(self.filepath))
-        self.original = container.original
-        self.loader_data = container.loader_data
-        self.channels = self._detect_channels()
-        self.channel_names = self._get_channel_names()
-        self.data_min = np.min(self.original)
-        self.data_max = np.max(self.original)
-        
+
     def _detect_channels(self):
         if len(self.original.shape) == 2:
             return 1
         return self.original.shape[2]
-    
+
     def _get_channel_names(self):
         if self.channels == 1:
             return ["Gray"]
@@ -37,8 +146,13 @@ class ImageContainer(BaseContainer):
             return ["B", "G", "R", "A"]
         else:
             return [f"Ch{i}" for i in range(self.channels)]
-    
+
     def get_channel(self, index):
         if self.channels == 1:
             return self.original
-        return cv2.split(self.original)[index]
\ No newline at end of file
+        return self.get_intermediate('channel_planes')[index]
+
+    def get_channel_view(self, index):
+        if self.channels == 1:
+            return self.original
+        return self.original[:, :, index]
@@ -1 +1 @@
-from file_loaders.factory import get_loader, get_all_extensions
\ No newline at end of file
+from file_loaders.factory import get_loader, get_all_extensions, is_supported
\ No newline at end of file
@@ -1,9 +1,20 @@
 from abc import ABC, abstractmethod
 
 class FileLoader(ABC):
+    _active_dialog = None
+    
     def __init__(self):
         self.stored_params = None
     
+    @classmethod
+    def close_active_dialog(cls):
+        if FileLoader._active_dialog:
+            FileLoader._active_dialog.close()
+            FileLoader._active_dialog = None
+    
+    def prepare(self, filepath):
+        return True
+    
     @abstractmethod
     def create_container(self, filepath):
         pass
@@ -11,7 +22,18 @@ class FileLoader(ABC):
     def reload_container(self, filepath):
         return self.create_container(filepath)
     
+    def get_frame_source(self, filepath):
+        return None
+    
     @property
     @abstractmethod
     def extensions(self):
-        pass
\ No newline at end of file
+        pass
+    
+    def _exec_dialog(self, dialog):
+        FileLoader._active_dialog = dialog
+        try:
+            return dialog.exec()
+        finally:
+            if FileLoader._active_dialog is dialog:
+                FileLoader._active_dialog = None
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+from core.cache_utils import get_cache_dir, file_identity
+from core.settings import Settings
+
+# Hits only move access times, so they reach index.json at most this often, in seconds
+INDEX_FLUSH_INTERVAL = 30.0
+
+class DecodeCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, directory=None, max_bytes=None, min_bytes=None):
+        settings = Settings()
+        self.directory = directory or get_cache_dir('decoded')
+        self.max_bytes = max_bytes or settings.get('decode_cache_bytes', 4 << 30)
+        self.min_bytes = settings.get('decode_cache_min_bytes', 4 << 20) if min_bytes is None else min_bytes
+        self._index_path = self.directory / 'index.json'
+        self._lock = threading.Lock()
+        self._index = self._read_index()
+        self._index_written = time.monotonic()
+
+    @classmethod
+    def get_cache(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def get(self, identity):
+        key = self._key(identity)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or entry['identity'] != list(identity):
+                return None
+            try:
+                array = np.load(self.directory / entry['file'], mmap_mode='r')
+            except (OSError, ValueError):
+                self._remove(key)
+                self._write_index()
+                return None
+            entry['accessed'] = time.time()
+            if time.monotonic() - self._index_written >= INDEX_FLUSH_INTERVAL:
+                self._write_index()
+        return array
+
+    def put(self, identity, array):
+        if array.nbytes < self.min_bytes or array.dtype.hasobject:
+            return
+
+        key = self._key(identity)
+        filename = f"{key}.npy"
+        temp_path = None
+        try:
+            # A unique temp file per writer, so a reload racing read-ahead never shares one
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.npy')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            with self._lock:
+                # Fails while the previous blob is still mapped by an open container on some platforms
+                os.replace(temp_path, self.directory / filename)
+                self._index[key] = {'identity': list(identity), 'file': filename, 'size': array.nbytes, 'accessed': time.time()}
+                self._evict()
+                self._write_index()
+        except OSError:
+            # The image has already decoded; a cache that cannot be written is simply skipped
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _key(self, identity):
+        # One blob per path: a changed file replaces its stale decode instead of accumulating
+        return hashlib.sha1(identity[0].encode()).hexdigest()
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['accessed']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]['size']
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._index.pop(key)
+        try:
+            os.remove(self.directory / entry['file'])
+        except OSError:
+            pass
+
+    def _read_index(self):
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        self._index_written = time.monotonic()
+        temp_path = self._index_path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(self._index, f)
+            os.replace(temp_path, self._index_path)
+        except OSError:
+            # Only access times and new entries are lost; the index is rebuilt as blobs are written
+            pass
+
+def load_cached(filepath, decode):
+    try:
+        identity = file_identity(filepath)
+    except OSError:
+        return decode()
+
+    cache = DecodeCache.get_cache()
+    array = cache.get(identity)
+    if array is None:
+        array = decode()
+        if array is not None:
+            cache.put(identity, array)
+    return array
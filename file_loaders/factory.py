@@ -1,21 +1,50 @@
+from importlib.metadata import entry_points
 from pathlib import Path
-from file_loaders.base import FileLoader
-from file_loaders.image_loader import ImageLoader
-from file_loaders.npz_loader import NPZLoader
-from file_loaders.npy_loader import NPYLoader
-from file_loaders.pcl_loader import PCLLoader
+from core.registry import LoaderEntry
+
+PLUGIN_GROUP = 'image_analyzer.loaders'
+
+LOADERS = [
+    LoaderEntry('file_loaders.image_loader', 'ImageLoader', ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif']),
+    LoaderEntry('file_loaders.npz_loader', 'NPZLoader', ['.npz']),
+    LoaderEntry('file_loaders.npy_loader', 'NPYLoader', ['.npy']),
+    LoaderEntry('file_loaders.pcl_loader', 'PCLLoader', ['.pcd', '.ply'])
+]
+
+_extension_index = None
+
+def _plugin_loaders():
+    # Entry point name is the extension, value is "package.module:LoaderClass"
+    plugins = {}
+    for entry_point in entry_points(group=PLUGIN_GROUP):
+        ext = entry_point.name.lower()
+        if not ext.startswith('.'):
+            ext = '.' + ext
+        key = (entry_point.module, entry_point.attr)
+        if key not in plugins:
+            plugins[key] = LoaderEntry(entry_point.module, entry_point.attr, [])
+        plugins[key].extensions.append(ext)
+    return list(plugins.values())
+
+def _get_index():
+    global _extension_index
+    if _extension_index is None:
+        index = {}
+        for entry in LOADERS + _plugin_loaders():
+            for ext in entry.extensions:
+                index.setdefault(ext, entry)
+        _extension_index = index
+    return _extension_index
 
 def get_loader(filepath):
     ext = Path(filepath).suffix.lower()
-    
-    for loader_class in FileLoader.__subclasses__():
-        if ext in loader_class().extensions:
-            return loader_class()
-    
-    raise ValueError(f"Unsupported file type: {ext}")
+    entry = _get_index().get(ext)
+    if entry is None:
+        raise ValueError(f"Unsupported file type: {ext}")
+    return entry.load()()
 
 def get_all_extensions():
-    extensions = []
-    for loader_class in FileLoader.__subclasses__():
-        extensions.extend(loader_class().extensions)
-    return extensions
\ No newline at end of file
+    return list(_get_index())
+
+def is_supported(filepath):
+    return Path(filepath).suffix.lower() in _get_index()
\ No newline at end of file
@@ -1,15 +1,37 @@
 import cv2
+from pathlib import Path
 from file_loaders.base import FileLoader
+from file_loaders.tiled_tiff import TiledTIFFSource
+from file_loaders.decode_cache import load_cached
+from core.settings import Settings
 
 class ImageLoader(FileLoader):
+    TILED_EXTENSIONS = ['.tiff', '.tif']
+    
     def create_container(self, filepath):
         from data_containers.image_container import ImageContainer
-        image = cv2.imread(str(filepath), cv2.IMREAD_UNCHANGED)
+        self.stored_params = self.stored_params or {}
+        
+        if Path(filepath).suffix.lower() in self.TILED_EXTENSIONS:
+            max_pixels = Settings().get('tiff_max_pixels', 4096 * 4096)
+            source = TiledTIFFSource.open(filepath, max_pixels)
+            if source is not None:
+                # Sequence frames share stored_params, so a chosen level may be past this file's pyramid
+                level = self.stored_params.get('level')
+                level = source.level_for(max_pixels) if level is None else min(max(0, level), len(source.levels) - 1)
+                try:
+                    # A chosen level is still capped, so picking level 0 of a gigapixel pyramid is decimated
+                    image = source.read_level(level, max_pixels)
+                except Exception:
+                    source.close()
+                    raise
+                return ImageContainer(filepath, image, {'level': level}, self, source)
+        
+        image = load_cached(filepath, lambda: cv2.imread(str(filepath), cv2.IMREAD_UNCHANGED))
         if image is None:
             raise ValueError(f"Could not load image: {filepath}")
-        self.stored_params = {}
         return ImageContainer(filepath, image, {}, self)
     
     @property
     def extensions(self):
-        return ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif']
\ No newline at end of file
+        return ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif']
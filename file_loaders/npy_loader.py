@@ -1,47 +1,85 @@
 import numpy as np
-import open3d as o3d
+from numpy.lib import recfunctions
 from file_loaders.base import FileLoader
 from gui.npy_column_dialog import NPYColumnDialog
 
 class NPYLoader(FileLoader):
+    SAMPLE_ROWS = 20
+    COORD_FIELDS = ['x', 'y', 'z']
+    COLOR_FIELDS = [['r', 'g', 'b'], ['red', 'green', 'blue']]
+    PACKED_COLOR_FIELDS = ['rgb', 'rgba']
+    GRAY_FIELDS = ['intensity', 'gray']
+
+    def prepare(self, filepath):
+        if not self.stored_params:
+            data = np.load(filepath, mmap_mode='r')
+            if data.dtype.names:
+                self.stored_params = self._select_fields(data.dtype)
+            else:
+                if len(data.shape) != 2 or data.shape[1] < 3:
+                    raise ValueError(f"Expected 2D array with ≥3 columns, got shape {data.shape}")
+                self.stored_params = self._show_column_dialog(data)
+        return bool(self.stored_params)
+
     def create_container(self, filepath):
         from data_containers.pcl_container import PCLContainer
-        
-        data = np.load(filepath)
-        if len(data.shape) != 2 or data.shape[1] < 3:
-            raise ValueError(f"Expected 2D array with ≥3 columns, got shape {data.shape}")
-        
-        selection = self.stored_params or self._show_column_dialog(data)
-        if not selection:
+
+        if not self.prepare(filepath):
             return None
-        self.stored_params = selection
-        
-        points = data[:, selection['coord_start']:selection['coord_start']+3]
-        pcd = o3d.geometry.PointCloud()
-        pcd.points = o3d.utility.Vector3dVector(points)
-        
+        data = np.load(filepath, mmap_mode='r')
+        selection = self.stored_params
+
         loader_data = {}
-        
-        if selection.get('color_enabled'):
-            color_start = selection['color_start']
-            color_channels = selection['color_channels']
-            colors = data[:, color_start:color_start+color_channels]
+        if 'coord_fields' in selection:
+            points = recfunctions.structured_to_unstructured(data[selection['coord_fields']], copy=False)
+            colors = self._field_colors(data, selection)
+        else:
+            points = data[:, selection['coord_start']:selection['coord_start']+3]
+            colors = None
+            if selection.get('color_enabled'):
+                color_start = selection['color_start']
+                colors = data[:, color_start:color_start+selection['color_channels']]
+
+        if colors is not None:
             loader_data['original_colors'] = colors
-            
-            if color_channels == 1:
-                display_colors = np.column_stack([colors, colors, colors])
-            else:
-                display_colors = colors
-            pcd.colors = o3d.utility.Vector3dVector(display_colors / 255.0)
-        
-        return PCLContainer(filepath, pcd, loader_data, self)
-    
+
+        return PCLContainer(filepath, points, loader_data, self)
+
     @property
     def extensions(self):
         return ['.npy']
-    
+
+    def _select_fields(self, dtype):
+        names = {name.lower(): name for name in dtype.names}
+        if not all(field in names for field in self.COORD_FIELDS):
+            raise ValueError(f"Structured array needs x/y/z fields, got {dtype.names}")
+
+        selection = {'coord_fields': [names[field] for field in self.COORD_FIELDS]}
+        for fields in self.COLOR_FIELDS:
+            if all(field in names for field in fields):
+                selection['color_fields'] = [names[field] for field in fields]
+                return selection
+        for field in self.PACKED_COLOR_FIELDS:
+            if field in names and dtype[names[field]].itemsize == 4:
+                selection['packed_color_field'] = names[field]
+                return selection
+        for field in self.GRAY_FIELDS:
+            if field in names:
+                selection['color_fields'] = [names[field]]
+                return selection
+        return selection
+
+    def _field_colors(self, data, selection):
+        if 'color_fields' in selection:
+            return recfunctions.structured_to_unstructured(data[selection['color_fields']], copy=False)
+        if 'packed_color_field' in selection:
+            packed = data[selection['packed_color_field']].view(np.uint32)
+            return np.stack([(packed >> 16) & 255, (packed >> 8) & 255, packed & 255], axis=1).astype(np.uint8)
+        return None
+
     def _show_column_dialog(self, data):
-        dialog = NPYColumnDialog(data)
-        if dialog.exec() != NPYColumnDialog.DialogCode.Accepted:
+        sample = np.array(data[:self.SAMPLE_ROWS])
+        dialog = NPYColumnDialog(data.shape, data.dtype, sample)
+        if self._exec_dialog(dialog) != NPYColumnDialog.DialogCode.Accepted:
             return None
-        return dialog.get_selection()
\ No newline at end of file
+        return dialog.get_selection()
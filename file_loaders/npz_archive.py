@@ -0,0 +1,161 @@
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import warnings
+import zipfile
+from collections import OrderedDict
+import numpy as np
+from numpy.lib import format as npy_format
+from core.settings import Settings
+
+class ArrayInfo:
+    def __init__(self, shape, dtype, fortran_order=False, data_offset=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.fortran_order = fortran_order
+        self.data_offset = data_offset
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+
+class DecompressionCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._arrays = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            array = self._arrays.get(key)
+            if array is not None:
+                self._arrays.move_to_end(key)
+            return array
+
+    def put(self, key, array):
+        if array.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._arrays:
+                return
+            self._arrays[key] = array
+            self._size += array.nbytes
+            while self._size > self.max_bytes:
+                _, evicted = self._arrays.popitem(last=False)
+                self._size -= evicted.nbytes
+
+class NPZArchive:
+    LOCAL_HEADER = struct.Struct('<4s22xHH')
+    LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+    _cache = None
+
+    def __init__(self, filepath):
+        self.filepath = str(filepath)
+        stat = os.stat(self.filepath)
+        self._identity = (self.filepath, stat.st_size, stat.st_mtime_ns)
+        self.infos = {}
+        self._zip_infos = {}
+        self._spilled = {}
+        self._spill_lock = threading.Lock()
+        self._read_headers()
+
+    @classmethod
+    def get_cache(cls):
+        if cls._cache is None:
+            cls._cache = DecompressionCache(Settings().get('npz_cache_bytes', 1 << 30))
+        return cls._cache
+
+    def __len__(self):
+        return len(self.infos)
+
+    def __contains__(self, key):
+        return key in self.infos
+
+    def __getitem__(self, key):
+        if key not in self.infos:
+            raise KeyError(f"{key} is not a member of {self.filepath}")
+
+        info = self.infos[key]
+        if info.data_offset is not None:
+            return np.memmap(self.filepath, dtype=info.dtype, mode='r', offset=info.data_offset,
+                             shape=info.shape, order='F' if info.fortran_order else 'C')
+
+        cache = self.get_cache()
+        if info.nbytes > cache.max_bytes and not info.dtype.hasobject:
+            return self._spill(key, info)
+
+        array = cache.get((self._identity, key))
+        if array is None:
+            with zipfile.ZipFile(self.filepath) as archive, archive.open(self._zip_infos[key]) as f:
+                array = npy_format.read_array(f, allow_pickle=False)
+            array.flags.writeable = False
+            cache.put((self._identity, key), array)
+        return array
+
+    def _spill(self, key, info):
+        # Too big for the cache, so rather than inflating it again for every slice the member is
+        # decompressed once into an unlinked temporary file and memory-mapped from there
+        with self._spill_lock:
+            if key not in self._spilled:
+                warnings.warn(f"{key} in {self.filepath} decompresses to {info.nbytes} bytes, more than "
+                              f"npz_cache_bytes allows; spilling it to a temporary file", RuntimeWarning)
+                with zipfile.ZipFile(self.filepath) as archive, archive.open(self._zip_infos[key]) as f, \
+                        tempfile.TemporaryFile() as spill:
+                    self._read_array_header(f)
+                    shutil.copyfileobj(f, spill, 1 << 24)
+                    spill.flush()
+                    self._spilled[key] = np.memmap(spill, dtype=info.dtype, mode='r', shape=info.shape,
+                                                   order='F' if info.fortran_order else 'C')
+            return self._spilled[key]
+
+    def keys(self):
+        return list(self.infos.keys())
+
+    def items(self):
+        return self.infos.items()
+
+    def _read_headers(self):
+        with zipfile.ZipFile(self.filepath) as archive, open(self.filepath, 'rb') as raw:
+            for zip_info in archive.infolist():
+                if not zip_info.filename.endswith('.npy'):
+                    continue
+                with archive.open(zip_info) as f:
+                    shape, fortran_order, dtype = self._read_array_header(f)
+                    header_length = f.tell()
+
+                info = ArrayInfo(shape, dtype, fortran_order)
+                if self._is_mappable(zip_info, info):
+                    info.data_offset = self._member_data_offset(raw, zip_info) + header_length
+
+                key = zip_info.filename[:-4]
+                self.infos[key] = info
+                self._zip_infos[key] = zip_info
+
+    def _is_mappable(self, zip_info, info):
+        return (zip_info.compress_type == zipfile.ZIP_STORED and
+                not zip_info.flag_bits & 0x1 and
+                not info.dtype.hasobject and
+                info.ndim > 0 and info.nbytes > 0)
+
+    def _member_data_offset(self, raw, zip_info):
+        raw.seek(zip_info.header_offset)
+        signature, name_length, extra_length = self.LOCAL_HEADER.unpack(raw.read(self.LOCAL_HEADER.size))
+        if signature != self.LOCAL_HEADER_SIGNATURE:
+            raise ValueError(f"Corrupt zip member {zip_info.filename} in {self.filepath}")
+        return zip_info.header_offset + self.LOCAL_HEADER.size + name_length + extra_length
+
+    @staticmethod
+    def _read_array_header(f):
+        version = npy_format.read_magic(f)
+        if version == (1, 0):
+            return npy_format.read_array_header_1_0(f)
+        if version == (2, 0):
+            return npy_format.read_array_header_2_0(f)
+        return npy_format._read_array_header(f, version)
@@ -1,47 +1,70 @@
 import numpy as np
-import open3d as o3d
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel, QApplication, QRadioButton, QButtonGroup, QSplitter, QWidget, QSpinBox
 from PyQt6.QtCore import Qt, QTimer
 from file_loaders.base import FileLoader
+from file_loaders.npz_archive import NPZArchive, ArrayInfo
 
-class NPZLoader(FileLoader):
-    _current_dialog = None
+class NPZSliceSource:
+    def __init__(self, filepath, selection):
+        self.filepath = filepath
+        self.selection = selection
+        self.start_index = selection['index']
+        self.archive = NPZArchive(filepath)
+        self.count = self.archive.infos[selection['key']].shape[selection['axis']]
+    
+    def __len__(self):
+        return self.count
+    
+    def label(self, index):
+        return f"{self.selection['key']} [axis {self.selection['axis']}: {index}]"
     
-    @classmethod
-    def _close_existing_dialog(cls):
-        if cls._current_dialog:
-            cls._current_dialog.close()
-            cls._current_dialog = None
+    def load(self, index):
+        # Each slice gets its own loader so reloads and cache keys see that slice's selection
+        loader = NPZLoader()
+        loader.stored_params = dict(self.selection, index=index)
+        return loader._create_image_container(self.filepath, self.archive, loader.stored_params)
+
+class NPZLoader(FileLoader):
+    def prepare(self, filepath):
+        if not self.stored_params:
+            self.stored_params = self._show_selector(NPZArchive(filepath))
+        return bool(self.stored_params)
     
     def create_container(self, filepath):
-        data = np.load(filepath)
+        if not self.prepare(filepath):
+            return None
         
+        data = NPZArchive(filepath)
         selection = self.stored_params
-        if not selection:
-            selection = self._show_selector(data)
-            if not selection:
-                return None
-            self.stored_params = selection
         
         if selection['mode'] == 'image':
-            array = data[selection['key']]
-            if 'index' in selection:
-                slices = tuple(selection['index'] if j == selection['axis'] else slice(None) for j in range(array.ndim))
-                array = array[slices]
-            from data_containers.image_container import ImageContainer
-            return ImageContainer(filepath, array, selection, self)
+            return self._create_image_container(filepath, data, selection)
         else:
             from data_containers.pcl_container import PCLContainer
-            point_cloud, original_colors = self._project_depth(data, selection)
+            points, original_colors = self._project_depth(data, selection)
             enhanced_selection = selection.copy()
             if original_colors is not None:
                 enhanced_selection['original_colors'] = original_colors
-            return PCLContainer(filepath, point_cloud, enhanced_selection, self)
+            return PCLContainer(filepath, points, enhanced_selection, self)
+    
+    def get_frame_source(self, filepath):
+        if self.stored_params and 'index' in self.stored_params:
+            return NPZSliceSource(filepath, dict(self.stored_params))
+        return None
     
     @property
     def extensions(self):
         return ['.npz']
     
+    def _create_image_container(self, filepath, data, selection):
+        from data_containers.image_container import ImageContainer
+        
+        array = data[selection['key']]
+        if 'index' in selection:
+            slices = tuple(selection['index'] if j == selection['axis'] else slice(None) for j in range(array.ndim))
+            array = np.ascontiguousarray(array[slices])
+        return ImageContainer(filepath, array, selection, self)
+    
     def _is_indexable_image(self, array):
         if array.ndim not in [3, 4]:
             return False, -1, 0
@@ -49,8 +72,7 @@ class NPZLoader(FileLoader):
         smallest_axis = np.argmin(array.shape)
         remaining_shape = [array.shape[i] for i in range(array.ndim) if i != smallest_axis]
         
-        temp_array = np.zeros(remaining_shape)
-        if self._is_valid_image(temp_array):
+        if self._is_valid_image(ArrayInfo(remaining_shape, array.dtype)):
             return True, smallest_axis, array.shape[smallest_axis]
         return False, -1, 0
     
@@ -61,7 +83,6 @@ class NPZLoader(FileLoader):
             parent.activateWindow()
         
         dialog = QDialog(parent)
-        NPZLoader._current_dialog = dialog
         dialog.setWindowTitle("Select Arrays")
         dialog.setModal(True)
         dialog.resize(800, 500)
@@ -190,7 +211,7 @@ class NPZLoader(FileLoader):
                 return
             
             key = keys[current_row]
-            array = data[key]
+            array = data.infos[key]
             
             if self._is_valid_image(array):
                 selection = {'mode': 'image', 'key': key}
@@ -206,7 +227,6 @@ class NPZLoader(FileLoader):
         project_btn.clicked.connect(project)
         image_btn.clicked.connect(load_image)
         cancel_btn.clicked.connect(dialog.reject)
-        dialog.finished.connect(lambda: setattr(NPZLoader, '_current_dialog', None))
         
         dialog.show()
         dialog.raise_()
@@ -214,33 +234,28 @@ class NPZLoader(FileLoader):
         
         QTimer.singleShot(50, lambda: (dialog.raise_(), dialog.activateWindow()))
         
-        return selection if dialog.exec() == QDialog.DialogCode.Accepted else None
+        return selection if self._exec_dialog(dialog) == QDialog.DialogCode.Accepted else None
     
     def _is_valid_image(self, array):
-        return (isinstance(array, np.ndarray) and 
-                np.issubdtype(array.dtype, np.number) and
+        return (np.issubdtype(array.dtype, np.number) and
                 ((len(array.shape) == 2 and all(s > 1 for s in array.shape)) or
                  (len(array.shape) == 3 and array.shape[0] > 1 and array.shape[1] > 1 and array.shape[2] in {1, 3, 4})))
     
     def _is_valid_coord(self, array):
-        return (isinstance(array, np.ndarray) and 
-                np.issubdtype(array.dtype, np.number) and
+        return (np.issubdtype(array.dtype, np.number) and
                 len(array.shape) == 2 and all(s > 1 for s in array.shape))
     
     def _is_valid_color(self, array):
-        return (isinstance(array, np.ndarray) and 
-                np.issubdtype(array.dtype, np.number) and
+        return (np.issubdtype(array.dtype, np.number) and
                 ((len(array.shape) == 2 and all(s > 1 for s in array.shape)) or
                  (len(array.shape) == 3 and array.shape[0] > 1 and array.shape[1] > 1 and array.shape[2] in {1, 3, 4})))
     
     def _is_valid_focal(self, array):
-        return (isinstance(array, np.ndarray) and 
-                np.issubdtype(array.dtype, np.number) and
+        return (np.issubdtype(array.dtype, np.number) and
                 (array.shape == () or (len(array.shape) == 1 and array.shape[0] == 1)))
     
     def _is_valid_matrix(self, array):
-        return (isinstance(array, np.ndarray) and
-                np.issubdtype(array.dtype, np.number) and
+        return (np.issubdtype(array.dtype, np.number) and
                 len(array.shape) == 2 and
                 array.shape in [(3, 3), (3, 4), (4, 4)])
 
@@ -252,26 +267,15 @@ class NPZLoader(FileLoader):
         intrinsic_matrix = data[selection['matrix']] if selection['matrix'] else None
         
         points, mask = project_depth_to_pointcloud(depth_array, focal_length, intrinsic_matrix)
-
-        pcd = o3d.geometry.PointCloud()
-        pcd.points = o3d.utility.Vector3dVector(points)
         
         original_colors = None
         if selection['color']:
             color_array = data[selection['color']]
-            if len(color_array.shape) == 2:
-                original_colors = color_array[mask]
-                colors = np.column_stack([original_colors, original_colors, original_colors]) / 255.0
-            else:
-                original_colors = color_array[mask]
-                if color_array.shape[2] == 1:
-                    colors = np.column_stack([original_colors[:, 0], original_colors[:, 0], original_colors[:, 0]]) / 255.0
-                elif color_array.shape[2] == 3:
+            original_colors = color_array[mask]
+            if len(color_array.shape) == 3:
+                if color_array.shape[2] == 3:
                     original_colors = original_colors[:, [2, 1, 0]]
-                    colors = original_colors / 255.0
                 elif color_array.shape[2] == 4:
                     original_colors = original_colors[:, [2, 1, 0, 3]]
-                    colors = original_colors[:, :3] / 255.0
-            pcd.colors = o3d.utility.Vector3dVector(colors)
         
-        return pcd, original_colors
\ No newline at end of file
+        return points, original_colors
\ No newline at end of file
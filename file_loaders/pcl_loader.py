@@ -1,3 +1,4 @@
+import numpy as np
 import open3d as o3d
 from file_loaders.base import FileLoader
 
@@ -8,8 +9,8 @@ class PCLLoader(FileLoader):
         if len(pcd.points) == 0:
             raise ValueError(f"Empty point cloud: {filepath}")
         self.stored_params = {}
-        return PCLContainer(filepath, pcd, {}, self)
+        return PCLContainer(filepath, np.asarray(pcd.points), {}, self, colors=np.asarray(pcd.colors))
     
     @property
     def extensions(self):
-        return ['.pcd', '.ply']
\ No newline at end of file
+        return ['.pcd', '.ply']
@@ -0,0 +1,45 @@
+import glob
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from file_loaders.factory import get_loader, is_supported
+
+def natural_sort_key(path):
+    return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', os.path.basename(str(path)))]
+
+def is_sequence_pattern(pattern):
+    return os.path.isdir(pattern) or glob.has_magic(pattern)
+
+def find_sequence(pattern):
+    if os.path.isdir(pattern):
+        paths = [str(path) for path in Path(pattern).iterdir() if path.is_file() and is_supported(path)]
+    else:
+        paths = [path for path in glob.glob(pattern) if os.path.isfile(path) and is_supported(path)]
+
+    if not paths:
+        return []
+
+    # A directory of frames often carries a calibration file or two; keep the dominant format
+    suffix = Counter(Path(path).suffix.lower() for path in paths).most_common(1)[0][0]
+    return sorted((path for path in paths if Path(path).suffix.lower() == suffix), key=natural_sort_key)
+
+class FileSequenceSource:
+    def __init__(self, paths, loader, start_index=0):
+        self.paths = paths
+        self.params = dict(loader.stored_params or {})
+        self.start_index = start_index
+
+    def __len__(self):
+        return len(self.paths)
+
+    def label(self, index):
+        return os.path.basename(self.paths[index])
+
+    def load(self, index):
+        loader = get_loader(self.paths[index])
+        loader.stored_params = dict(self.params)
+        container = loader.create_container(self.paths[index])
+        if container is None:
+            raise ValueError(f"Could not load {self.paths[index]}")
+        return container
@@ -0,0 +1,120 @@
+import math
+import threading
+import cv2
+import numpy as np
+
+# Dtypes cv2.resize can average; anything else is decimated by nearest sampling
+RESIZABLE_DTYPES = (np.uint8, np.uint16, np.int16, np.float32, np.float64)
+
+class TiledTIFFSource:
+    def __init__(self, tiff):
+        self._tiff = tiff
+        self._lock = threading.Lock()
+        self._pages = [level.keyframe for level in tiff.series[0].levels]
+
+        page = self._pages[0]
+        self.dtype = page.dtype
+        self.channels = page.samplesperpixel
+        self.levels = [(p.imagelength, p.imagewidth) for p in self._pages]
+        self._channel_order = None
+        if page.photometric == 2 and self.channels in (3, 4):
+            self._channel_order = [2, 1, 0, 3][:self.channels]
+
+    @classmethod
+    def open(cls, filepath, min_pixels):
+        try:
+            import tifffile
+        except ImportError:
+            return None
+
+        tiff = None
+        try:
+            tiff = tifffile.TiffFile(str(filepath))
+            page = tiff.series[0].levels[0].keyframe
+            if (page.is_tiled and page.planarconfig == 1 and page.imagedepth == 1 and
+                    page.imagelength * page.imagewidth > min_pixels):
+                return cls(tiff)
+        except Exception:
+            # Anything tifffile cannot read is left to the cv2 path
+            pass
+        if tiff is not None:
+            tiff.close()
+        return None
+
+    def close(self):
+        self._tiff.close()
+
+    def level_for(self, max_pixels):
+        for level, (height, width) in enumerate(self.levels):
+            if height * width <= max_pixels:
+                return level
+        return len(self.levels) - 1
+
+    def read_level(self, level, max_pixels=None):
+        height, width = self.levels[level]
+        if max_pixels is None or height * width <= max_pixels:
+            return self.read_region(level, 0, height, 0, width)
+        return self._read_decimated(level, math.sqrt(max_pixels / (height * width)))
+
+    def read_region(self, level, y0, y1, x0, x1):
+        page = self._pages[level]
+        out = np.empty((y1 - y0, x1 - x0, self.channels), dtype=self.dtype)
+
+        for tile_y, tile_x, tile in self._tiles(page, y0, y1, x0, x1):
+            ty0, tx0 = max(y0, tile_y), max(x0, tile_x)
+            ty1, tx1 = min(y1, tile_y + tile.shape[0]), min(x1, tile_x + tile.shape[1])
+            out[ty0 - y0:ty1 - y0, tx0 - x0:tx1 - x0] = tile[ty0 - tile_y:ty1 - tile_y, tx0 - tile_x:tx1 - tile_x]
+
+        return self._finish(out)
+
+    def _read_decimated(self, level, scale):
+        page = self._pages[level]
+        height, width = self.levels[level]
+        out = np.empty((max(1, round(height * scale)), max(1, round(width * scale)), self.channels), dtype=self.dtype)
+
+        for tile_y, tile_x, tile in self._tiles(page, 0, height, 0, width):
+            dy0, dx0 = round(tile_y * scale), round(tile_x * scale)
+            dy1, dx1 = round((tile_y + tile.shape[0]) * scale), round((tile_x + tile.shape[1]) * scale)
+            if dy1 <= dy0 or dx1 <= dx0:
+                continue
+            out[dy0:dy1, dx0:dx1] = self._shrink(tile, dx1 - dx0, dy1 - dy0)
+
+        return self._finish(out)
+
+    def _shrink(self, tile, width, height):
+        if self.dtype in RESIZABLE_DTYPES:
+            resized = cv2.resize(tile, (width, height), interpolation=cv2.INTER_AREA)
+            return resized.reshape(height, width, self.channels)
+        rows = (np.arange(height) + 0.5) * tile.shape[0] // height
+        cols = (np.arange(width) + 0.5) * tile.shape[1] // width
+        return tile[rows.astype(np.intp)][:, cols.astype(np.intp)]
+
+    def _tiles(self, page, y0, y1, x0, x1):
+        tile_height, tile_width = page.tilelength, page.tilewidth
+        tiles_across = math.ceil(page.imagewidth / tile_width)
+
+        for row in range(y0 // tile_height, math.ceil(y1 / tile_height)):
+            for col in range(x0 // tile_width, math.ceil(x1 / tile_width)):
+                index = row * tiles_across + col
+                segment, (_, _, tile_y, tile_x, _), shape = page.decode(
+                    self._read_segment(page, index), index, jpegtables=page.jpegtables)
+                if segment is None:
+                    segment = np.zeros(shape, dtype=self.dtype)
+                tile = segment.reshape(shape[1], shape[2], self.channels)
+                yield tile_y, tile_x, tile[:page.imagelength - tile_y, :page.imagewidth - tile_x]
+
+    def _read_segment(self, page, index):
+        offset, count = page.dataoffsets[index], page.databytecounts[index]
+        if not count:
+            return None
+        with self._lock:
+            handle = self._tiff.filehandle
+            handle.seek(offset)
+            return handle.read(count)
+
+    def _finish(self, image):
+        if self._channel_order:
+            image = image[:, :, self._channel_order]
+        if self.channels == 1:
+            return image[:, :, 0]
+        return np.ascontiguousarray(image)
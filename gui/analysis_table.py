@@ -1,8 +1,10 @@
 from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem, QHeaderView, QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 import json
 
 class AnalysisTable(QWidget):
+    compute_requested = pyqtSignal(int)
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(self)
@@ -16,17 +18,57 @@ class AnalysisTable(QWidget):
         self._tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self._tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         layout.addWidget(self._tree)
+        self._tree.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self._groups = {}
 
     def set_cursor_info(self, text):
         self._cursor_label.setText(text)
 
     def update_properties(self, properties):
+        self.clear()
+        self.add_properties(0, properties)
+    
+    def clear(self):
         self._tree.clear()
+        self._groups = {}
+    
+    def add_properties(self, order, properties):
+        items = []
         for prop_name, value, is_expandable in properties:
             item = QTreeWidgetItem([prop_name, str(value) if not is_expandable else "[Expandable]"])
             if is_expandable:
                 self._add_children(item, self._serialize(value))
-            self._tree.addTopLevelItem(item)
+            items.append(item)
+        self._insert_group(order, items)
+    
+    def add_placeholder(self, order, module_name, cost):
+        self._add_action_item(order, module_name, f"Skipped (est. {cost:.1f} s), double-click to compute")
+    
+    def add_failure(self, order, module_name, error):
+        self._add_action_item(order, module_name, f"Failed ({error}), double-click to retry")
+    
+    def _add_action_item(self, order, module_name, text):
+        item = QTreeWidgetItem([module_name, text])
+        item.setData(0, Qt.ItemDataRole.UserRole, order)
+        self._insert_group(order, [item])
+    
+    def _insert_group(self, order, items):
+        # Groups arrive in completion order but are kept in module order; a result replaces its placeholder
+        self._remove_group(order)
+        index = sum(len(group) for key, group in self._groups.items() if key < order)
+        self._tree.insertTopLevelItems(index, items)
+        self._groups[order] = items
+    
+    def _remove_group(self, order):
+        for item in self._groups.pop(order, []):
+            self._tree.takeTopLevelItem(self._tree.indexOfTopLevelItem(item))
+    
+    def _on_item_double_clicked(self, item, column):
+        order = item.data(0, Qt.ItemDataRole.UserRole)
+        if order is not None and item.parent() is None:
+            item.setData(0, Qt.ItemDataRole.UserRole, None)
+            item.setText(1, "Computing...")
+            self.compute_requested.emit(order)
     
     def _add_children(self, parent, data):
         if isinstance(data, dict):
@@ -0,0 +1,44 @@
+from PyQt6.QtWidgets import QToolBar, QSlider, QLabel, QToolButton
+from PyQt6.QtCore import Qt, pyqtSignal
+
+class FrameBar(QToolBar):
+    index_changed = pyqtSignal(int)
+    play_toggled = pyqtSignal(bool)
+
+    def __init__(self):
+        super().__init__("Frames")
+        self.setMovable(False)
+
+        self.play_button = QToolButton()
+        self.play_button.setText("Play")
+        self.play_button.setCheckable(True)
+        self.play_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.play_button.toggled.connect(self.play_toggled.emit)
+
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.slider.valueChanged.connect(self.index_changed.emit)
+        self.label = QLabel()
+        self.label.setMinimumWidth(160)
+
+        self.addWidget(self.play_button)
+        self.addWidget(self.slider)
+        self.addWidget(self.label)
+
+    def set_range(self, count, index):
+        self.slider.blockSignals(True)
+        self.slider.setRange(0, max(0, count - 1))
+        self.slider.setValue(index)
+        self.slider.blockSignals(False)
+
+    def set_index(self, index, label):
+        self.slider.blockSignals(True)
+        self.slider.setValue(index)
+        self.slider.blockSignals(False)
+        self.label.setText(f"{index + 1} / {self.slider.maximum() + 1}  {label}")
+
+    def set_playing(self, playing):
+        self.play_button.blockSignals(True)
+        self.play_button.setChecked(playing)
+        self.play_button.setText("Pause" if playing else "Play")
+        self.play_button.blockSignals(False)
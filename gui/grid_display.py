@@ -1,9 +1,11 @@
-from PyQt6.QtWidgets import QScrollArea, QGridLayout, QLabel, QVBoxLayout, QWidget
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QScrollArea, QGridLayout, QLabel, QVBoxLayout, QWidget, QPushButton
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 import math
 
 class GridDisplay(QScrollArea):
+    compute_requested = pyqtSignal(int)
+
     def __init__(self):
         super().__init__()
         self.setWidgetResizable(True)
@@ -11,15 +13,18 @@ class GridDisplay(QScrollArea):
         self.scroll_widget = QWidget()
         self.grid_layout = QGridLayout(self.scroll_widget)
         self.setWidget(self.scroll_widget)
+        self._tiles = []
     
     def update_grid(self, visualizations):
+        self.clear()
+        self.add_visualizations(0, visualizations)
+    
+    def clear(self):
         self._clear_grid()
-        
-        if not visualizations:
-            return
-        
-        cols = math.ceil(math.sqrt(len(visualizations)))
-        
+        self._tiles = []
+    
+    def add_visualizations(self, order, visualizations):
+        self._remove_tiles(order)
         for i, (title, widget) in enumerate(visualizations):
             container = QWidget()
             layout = QVBoxLayout(container)
@@ -31,7 +36,43 @@ class GridDisplay(QScrollArea):
             layout.addWidget(title_label)
             
             layout.addWidget(widget)
-            
+            self._tiles.append(((order, i), container))
+        
+        self._layout_tiles()
+    
+    def add_placeholder(self, order, module_name, cost):
+        self._add_button(order, module_name, f"Compute {module_name}\n(est. {cost:.1f} s)")
+    
+    def add_failure(self, order, module_name, error):
+        self._add_button(order, module_name, f"Retry {module_name}\n(failed: {error})")
+    
+    def _add_button(self, order, module_name, text):
+        button = QPushButton(text)
+        button.setMinimumSize(200, 120)
+        
+        def request():
+            button.setEnabled(False)
+            button.setText(f"Computing {module_name}...")
+            self.compute_requested.emit(order)
+        
+        button.clicked.connect(request)
+        self.add_visualizations(order, [(module_name, button)])
+    
+    def _remove_tiles(self, order):
+        for key, container in self._tiles:
+            if key[0] == order:
+                self.grid_layout.removeWidget(container)
+                container.deleteLater()
+        self._tiles = [tile for tile in self._tiles if tile[0][0] != order]
+    
+    def _layout_tiles(self):
+        # Tiles arrive in completion order; re-flow them in module order as the grid grows
+        self._tiles.sort(key=lambda tile: tile[0])
+        cols = max(1, math.ceil(math.sqrt(len(self._tiles))))
+        
+        for _, container in self._tiles:
+            self.grid_layout.removeWidget(container)
+        for i, (_, container) in enumerate(self._tiles):
             self.grid_layout.addWidget(container, i // cols, i % cols)
     
     def _clear_grid(self):
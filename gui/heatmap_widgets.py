@@ -4,8 +4,9 @@ from gui.save_icon_overlay import add_save_functionality
 from utils.heatmap_utils import (apply_colormap_to_data, add_heatmap_right_click_menu, 
                                 create_heatmap_colorbar_widget, create_heatmap_layout)
 
-def create_heatmap_widget(colormap_name, min_val, max_val, original_channel_data, module_name, dual_axis=False, unit_converter=None):
-    heatmap_rgb = apply_colormap_to_data(original_channel_data, colormap_name)
+def create_heatmap_widget(colormap_name, min_val, max_val, original_channel_data, module_name, dual_axis=False, unit_converter=None, heatmap_rgb=None):
+    if heatmap_rgb is None:
+        heatmap_rgb = apply_colormap_to_data(original_channel_data, colormap_name)
     image_widget = _create_label_from_cv2(heatmap_rgb)
     
     height, width = heatmap_rgb.shape[:2]
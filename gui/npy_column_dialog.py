@@ -1,20 +1,20 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QSpinBox, QCheckBox, QPushButton, QLabel, QRadioButton, QButtonGroup
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QSpinBox, QCheckBox, QPushButton, QLabel, QRadioButton, QButtonGroup, QTableWidget, QTableWidgetItem
 
 class NPYColumnDialog(QDialog):
-    def __init__(self, data):
+    def __init__(self, shape, dtype, sample):
         super().__init__()
-        self.data = data
         self.setWindowTitle("NPY Column Selection")
         self.setModal(True)
-        self.resize(300, 200)
+        self.resize(500, 350)
         
         layout = QVBoxLayout(self)
-        layout.addWidget(QLabel(f"Shape: {data.shape}, Type: {data.dtype}"))
+        layout.addWidget(QLabel(f"Shape: {shape}, Type: {dtype}"))
+        layout.addWidget(self._create_sample_table(sample))
         
         coord_layout = QHBoxLayout()
         coord_layout.addWidget(QLabel("Coordinates start:"))
         self.coord_spin = QSpinBox()
-        self.coord_spin.setRange(0, max(0, data.shape[1] - 3))
+        self.coord_spin.setRange(0, max(0, shape[1] - 3))
         coord_layout.addWidget(self.coord_spin)
         layout.addLayout(coord_layout)
         
@@ -23,8 +23,8 @@ class NPYColumnDialog(QDialog):
         
         color_layout = QHBoxLayout()
         self.color_spin = QSpinBox()
-        self.color_spin.setRange(0, data.shape[1] - 1)
-        self.color_spin.setValue(3 if data.shape[1] > 3 else 0)
+        self.color_spin.setRange(0, shape[1] - 1)
+        self.color_spin.setValue(3 if shape[1] > 3 else 0)
         self.color_spin.setEnabled(False)
         
         self.color_group = QButtonGroup()
@@ -52,6 +52,15 @@ class NPYColumnDialog(QDialog):
         button_layout.addWidget(cancel_btn)
         layout.addLayout(button_layout)
     
+    def _create_sample_table(self, sample):
+        table = QTableWidget(sample.shape[0], sample.shape[1])
+        table.setHorizontalHeaderLabels([str(i) for i in range(sample.shape[1])])
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        for row in range(sample.shape[0]):
+            for col in range(sample.shape[1]):
+                table.setItem(row, col, QTableWidgetItem(f"{sample[row, col]:.6g}"))
+        return table
+    
     def _toggle_color(self, enabled):
         self.color_spin.setEnabled(enabled)
         self.radio_1ch.setEnabled(enabled)
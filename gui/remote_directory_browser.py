@@ -91,8 +91,7 @@ class RemoteDirectoryBrowser(QDialog):
             self.file_tree.clear()
             self.search_field.clear()
             
-            from file_loaders import get_all_extensions
-            extensions = set(get_all_extensions())
+            from file_loaders import is_supported
             
             items = list(self.sftp.listdir_attr(self.current_path))
             directories = []
@@ -101,7 +100,7 @@ class RemoteDirectoryBrowser(QDialog):
             for item in items:
                 if stat.S_ISDIR(item.st_mode):
                     directories.append(item)
-                elif any(item.filename.lower().endswith(ext) for ext in extensions):
+                elif is_supported(item.filename):
                     files.append(item)
             
             sorted_directories = self._natural_sort([item.filename for item in directories])
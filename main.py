@@ -1,15 +1,31 @@
 #!/usr/bin/env python3
 
+import time
+STARTED = time.perf_counter()
+
 import sys
 import os
 import signal
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.app import ImageAnalyzerApp
+from file_loaders.sequence import is_sequence_pattern
+
+def report_startup(app):
+    elapsed = (time.perf_counter() - STARTED) * 1000
+    heavy = [name for name in ('pyvista', 'vtk', 'open3d', 'sklearn') if name in sys.modules]
+    print(f"Time to first window: {elapsed:.0f} ms")
+    print(f"Heavy modules imported: {', '.join(heavy) or 'none'}")
+    app.quit()
 
 def main():
+    measure_startup = '--measure-startup' in sys.argv
+    if measure_startup:
+        sys.argv.remove('--measure-startup')
+
     app = QApplication(sys.argv)
     
     def signal_handler(sig, frame):
@@ -21,9 +37,14 @@ def main():
     window = ImageAnalyzerApp()
     
     if len(sys.argv) > 1:
-        window.load_image(sys.argv[1])
+        if is_sequence_pattern(sys.argv[1]):
+            window.load_sequence(sys.argv[1])
+        else:
+            window.load_image(sys.argv[1])
     
     window.show()
+    if measure_startup:
+        QTimer.singleShot(0, lambda: report_startup(app))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
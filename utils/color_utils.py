@@ -1,19 +1,45 @@
 import numpy as np
 
-def generate_golden_ratio_hsv_colors(unique_values):
-    golden_ratio = (1 + 5**0.5) / 2
-    colors = []
-    
-    for i, value in enumerate(sorted(unique_values)):
-        hue = (i / golden_ratio) % 1.0
-        saturation = 0.8
-        brightness = 0.9
-        
-        hsv_color = (
-            int(hue * 179),
-            int(saturation * 255), 
-            int(brightness * 255)
-        )
-        colors.append(hsv_color)
-    
-    return colors
\ No newline at end of file
+GOLDEN_FRACTION = (5 ** 0.5 - 1) / 2
+
+def hsv_to_rgb(hue, saturation, value):
+    # hue, saturation and value in [0, 1], as scalars or arrays; returns float RGB in [0, 1] with a trailing axis of 3
+    hue, saturation, value = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (hue, saturation, value)))
+    scaled = (hue % 1.0) * 6.0
+    sector = scaled.astype(np.int64) % 6
+    f = scaled - np.floor(scaled)
+    p, q, t = value * (1 - saturation), value * (1 - saturation * f), value * (1 - saturation * (1 - f))
+    return np.stack([
+        np.choose(sector, [value, q, p, p, t, value]),
+        np.choose(sector, [t, value, value, q, p, p]),
+        np.choose(sector, [p, p, t, value, value, q]),
+    ], axis=-1)
+
+def golden_ratio_hues(count, offset=0.0):
+    return (offset + np.arange(count) * GOLDEN_FRACTION) % 1.0
+
+def uniform_hues(count):
+    return np.arange(count) / max(1, count)
+
+def hue_palette(hues, saturation=1.0, value=1.0):
+    return (hsv_to_rgb(hues, saturation, value) * 255).astype(np.uint8)
+
+def golden_ratio_palette(count, saturation=0.8, value=0.9):
+    return hue_palette(golden_ratio_hues(count), saturation, value)
+
+def uniform_palette(count, saturation=1.0, value=1.0):
+    return hue_palette(uniform_hues(count), saturation, value)
+
+def endpoints_palette(count):
+    # Black and white at the ends with uniform hues between; a single entry is mid grey
+    if count == 1:
+        return np.full((1, 3), 128, dtype=np.uint8)
+    colors = np.zeros((count, 3), dtype=np.uint8)
+    colors[-1] = 255
+    colors[1:-1] = uniform_palette(count - 2)
+    return colors
+
+def seeded_permutations(count, n, seed=0):
+    # n orderings of range(count) as rows, the identity first, reproducible for a given seed
+    rng = np.random.default_rng(seed)
+    return np.vstack([np.arange(count), rng.permuted(np.tile(np.arange(count), (n, 1)), axis=1)])
\ No newline at end of file
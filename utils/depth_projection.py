@@ -1,20 +1,55 @@
+import threading
+from collections import OrderedDict
 import numpy as np
 
-def project_depth_to_pointcloud(depth_array, focal_length=None, intrinsic_matrix=None):
+BAND_PIXELS = 1 << 20
+RAY_CACHE_ENTRIES = 16
+
+_rays = OrderedDict()
+_rays_lock = threading.Lock()
+
+def project_depth_to_pointcloud(depth_array, focal_length=None, intrinsic_matrix=None, band_pixels=BAND_PIXELS):
     h, w = depth_array.shape
-    
+
     if np.issubdtype(depth_array.dtype, np.integer):
-        if np.any(depth_array < 0):
+        if depth_array.dtype.kind == 'i' and np.any(depth_array < 0):
             raise ValueError("Negative depth values found in integer depth array")
         depth_shift = 1000.0
     else:
         depth_shift = 1.0
-    
+
+    fx, fy, cx, cy, bx, by = _intrinsics(h, w, focal_length, intrinsic_matrix)
+    ray_x, ray_y = _ray_table(h, w, fx, fy, cx, cy)
+
+    # Only valid pixels are written, straight into float32 output, one band of rows at a time
+    mask = depth_array != 0
+    points = np.empty((np.count_nonzero(mask), 3), dtype=np.float32)
+    rows = max(1, band_pixels // max(1, w))
+    offset = 0
+
+    for start in range(0, h, rows):
+        band_mask = mask[start:start + rows]
+        v, u = np.nonzero(band_mask)
+        z = points[offset:offset + len(u), 2]
+        z[:] = depth_array[start:start + rows][band_mask]
+        if depth_shift != 1.0:
+            z /= np.float32(depth_shift)
+        np.multiply(ray_x[u], z, out=points[offset:offset + len(u), 0])
+        np.multiply(ray_y[v + start], z, out=points[offset:offset + len(u), 1])
+        offset += len(u)
+
+    if bx:
+        points[:, 0] += np.float32(bx)
+    if by:
+        points[:, 1] += np.float32(by)
+    return points, mask
+
+def _intrinsics(h, w, focal_length, intrinsic_matrix):
     if focal_length is None:
         focal_length = 50.0
-    
+
     f_px = focal_length * np.sqrt(w**2 + h**2) / np.sqrt(36**2 + 24**2)
-    
+
     if intrinsic_matrix is None:
         intrinsic = np.array([
             [f_px, 0, w/2, 0],
@@ -31,19 +66,21 @@ def project_depth_to_pointcloud(depth_array, focal_length=None, intrinsic_matrix
             intrinsic[:3, :] = intrinsic_matrix
         else:
             intrinsic = intrinsic_matrix
-    
-    x, y = np.meshgrid(np.arange(w), np.arange(h))
-    mask = depth_array != 0
-    
-    uv_depth = np.stack([x, y, depth_array / depth_shift], axis=-1)
-    uv_depth = uv_depth[mask]
-    
-    fx, fy = intrinsic[0, 0], intrinsic[1, 1]
-    cx, cy = intrinsic[0, 2], intrinsic[1, 2]
-    bx, by = intrinsic[0, 3], intrinsic[1, 3]
-    
-    X = (uv_depth[:, 0] - cx) * uv_depth[:, 2] / fx + bx
-    Y = (uv_depth[:, 1] - cy) * uv_depth[:, 2] / fy + by
-    points = np.column_stack([X, Y, uv_depth[:, 2]])
-    
-    return points, mask
\ No newline at end of file
+
+    return (float(intrinsic[0, 0]), float(intrinsic[1, 1]), float(intrinsic[0, 2]), float(intrinsic[1, 2]),
+            float(intrinsic[0, 3]), float(intrinsic[1, 3]))
+
+def _ray_table(h, w, fx, fy, cx, cy):
+    # Rays are separable: x only depends on the column and y on the row, so a table is w + h slopes
+    key = (h, w, fx, fy, cx, cy)
+    with _rays_lock:
+        if key in _rays:
+            _rays.move_to_end(key)
+            return _rays[key]
+
+    rays = (((np.arange(w) - cx) / fx).astype(np.float32), ((np.arange(h) - cy) / fy).astype(np.float32))
+    with _rays_lock:
+        _rays[key] = rays
+        while len(_rays) > RAY_CACHE_ENTRIES:
+            _rays.popitem(last=False)
+    return rays
\ No newline at end of file
@@ -0,0 +1,84 @@
+import numpy as np
+
+MINIBATCH_THRESHOLD = 50000
+
+def find_dominant_colors(values, counts, k=5, max_samples=10000, n_init=4, max_iter=100, seed=42, budget=None):
+    # The work is a fixed number of seeded restarts and iterations, so results do not depend on machine speed.
+    # A budget that runs out stops early instead; the colours come back marked unfinished
+    points, weights = weighted_sample(values, counts, max_samples, seed)
+    k = min(k, len(points))
+    finished = True
+
+    try:
+        from sklearn.cluster import KMeans, MiniBatchKMeans
+    except ImportError:
+        best = None
+        for run in range(max(1, n_init)):
+            if run and budget is not None and budget.should_stop():
+                finished = False
+                break
+            centers, labels, inertia, complete = _weighted_kmeans(points, weights, k, seed + run, max_iter, budget)
+            finished = finished and complete
+            if best is None or inertia < best[2]:
+                best = (centers, labels, inertia)
+        centers, labels = best[0], best[1]
+    else:
+        best = None
+        for run in range(max(1, n_init)):
+            if run and budget is not None and budget.should_stop():
+                finished = False
+                break
+            if len(points) > MINIBATCH_THRESHOLD:
+                model = MiniBatchKMeans(n_clusters=k, n_init=1, max_iter=max_iter, random_state=seed + run, batch_size=4096)
+            else:
+                model = KMeans(n_clusters=k, n_init=1, max_iter=max_iter, random_state=seed + run)
+            model.fit(points, sample_weight=weights)
+            if best is None or model.inertia_ < best.inertia_:
+                best = model
+        centers, labels = best.cluster_centers_, best.labels_
+
+    cluster_weights = np.bincount(labels, weights=weights, minlength=k)
+    order = np.argsort(-cluster_weights, kind='stable')
+    return [tuple(int(round(c)) for c in center) for center in centers[order]], finished
+
+def weighted_sample(values, counts, max_samples, seed=42):
+    values = np.asarray(values, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.float64)
+    if len(values) <= max_samples:
+        return values, counts
+
+    rng = np.random.default_rng(seed)
+    drawn = rng.choice(len(values), size=max_samples, p=counts / counts.sum())
+    indices, multiplicity = np.unique(drawn, return_counts=True)
+    return values[indices], multiplicity.astype(np.float64)
+
+def _weighted_kmeans(points, weights, k, seed, max_iter, budget=None):
+    rng = np.random.default_rng(seed)
+    centers = np.empty((k, points.shape[1]))
+    centers[0] = points[rng.choice(len(points), p=weights / weights.sum())]
+    distances = np.square(points - centers[0]).sum(axis=1)
+    for i in range(1, k):
+        probabilities = distances * weights
+        total = probabilities.sum()
+        index = rng.choice(len(points), p=probabilities / total) if total > 0 else i
+        centers[i] = points[index]
+        distances = np.minimum(distances, np.square(points - centers[i]).sum(axis=1))
+
+    labels = np.zeros(len(points), dtype=np.int64)
+    finished = True
+    for _ in range(max_iter):
+        if budget is not None and budget.should_stop():
+            finished = False
+            break
+        labels = np.square(points[:, None, :] - centers[None]).sum(axis=2).argmin(axis=1)
+        totals = np.bincount(labels, weights=weights, minlength=k)
+        updated = centers.copy()
+        for c in range(points.shape[1]):
+            sums = np.bincount(labels, weights=weights * points[:, c], minlength=k)
+            updated[totals > 0, c] = sums[totals > 0] / totals[totals > 0]
+        converged = np.allclose(updated, centers)
+        centers = updated
+        if converged:
+            break
+    inertia = weights @ np.square(points - centers[labels]).sum(axis=1)
+    return centers, labels, inertia, finished
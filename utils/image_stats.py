@@ -0,0 +1,132 @@
+import numpy as np
+
+CHUNK_BYTES = 1 << 20
+
+class ImageStats:
+    def __init__(self, image, chunk_bytes=CHUNK_BYTES):
+        self.image = image
+        self.chunk_bytes = chunk_bytes
+        self.channels = 1 if image.ndim == 2 else image.shape[2]
+        self.count = np.zeros(self.channels, dtype=np.int64)
+        self.nan_count = np.zeros(self.channels, dtype=np.int64)
+        self.inf_count = np.zeros(self.channels, dtype=np.int64)
+        self._value_counts = None
+        self._histograms = {}
+
+        if self._is_small_integer(image.dtype):
+            self._scan_integer()
+        else:
+            self._scan_float()
+
+    @property
+    def has_nan(self):
+        return bool(self.nan_count.sum())
+
+    @property
+    def has_inf(self):
+        return bool(self.inf_count.sum())
+
+    def histogram(self, channel, bins=256):
+        # Integer images bin the exact value counts; float images need a second pass over finite values
+        key = (channel, bins)
+        if key not in self._histograms:
+            low, high = float(self.min[channel]), float(self.max[channel])
+            if not np.isfinite(low):
+                self._histograms[key] = (np.zeros(bins, dtype=np.int64), np.linspace(0, 1, bins + 1))
+            elif self._value_counts is not None:
+                values = np.arange(len(self._value_counts[channel])) + self._offset
+                self._histograms[key] = np.histogram(values, bins, (low, high), weights=self._value_counts[channel])
+            else:
+                counts = np.zeros(bins, dtype=np.int64)
+                for chunk in self._chunks():
+                    column = chunk[:, channel]
+                    counts += np.histogram(column[np.isfinite(column)], bins, (low, high))[0]
+                self._histograms[key] = (counts, np.linspace(low, high, bins + 1))
+        return self._histograms[key]
+
+    def _is_small_integer(self, dtype):
+        return dtype.kind == 'b' or (dtype.kind in 'ui' and dtype.itemsize <= 2)
+
+    def _chunks(self):
+        rows = max(1, self.chunk_bytes // max(1, self.image[:1].nbytes))
+        for start in range(0, self.image.shape[0], rows):
+            yield np.asarray(self.image[start:start + rows]).reshape(-1, self.channels)
+
+    def _scan_integer(self):
+        dtype = self.image.dtype
+        self._offset = 0 if dtype.kind in 'bu' else int(np.iinfo(dtype).min)
+        size = 2 if dtype.kind == 'b' else 1 << (8 * dtype.itemsize)
+        value_counts = np.zeros((self.channels, size), dtype=np.int64)
+
+        for chunk in self._chunks():
+            if dtype.kind == 'b':
+                chunk = chunk.view(np.uint8)
+            elif self._offset:
+                chunk = chunk.astype(np.int32) - self._offset
+            for c in range(self.channels):
+                value_counts[c] += np.bincount(chunk[:, c], minlength=size)
+
+        values = np.arange(size, dtype=np.float64) + self._offset
+        self.count = value_counts.sum(axis=1)
+        self.min = np.zeros(self.channels, dtype=np.int64)
+        self.max = np.zeros(self.channels, dtype=np.int64)
+        self.mean = np.zeros(self.channels)
+        self.std = np.zeros(self.channels)
+        for c in range(self.channels):
+            present = np.flatnonzero(value_counts[c])
+            if len(present) == 0:
+                continue
+            self.min[c], self.max[c] = present[0] + self._offset, present[-1] + self._offset
+            self.mean[c] = value_counts[c] @ values / self.count[c]
+            self.std[c] = np.sqrt(value_counts[c] @ (values - self.mean[c]) ** 2 / self.count[c])
+        self._value_counts = value_counts
+
+    def _scan_float(self):
+        dtype = self.image.dtype
+        if dtype.kind in 'ui':
+            # Wide integers keep exact extremes; float64 rounds int64 values past 2**53
+            self.min = np.full(self.channels, np.iinfo(dtype).max, dtype=dtype)
+            self.max = np.full(self.channels, np.iinfo(dtype).min, dtype=dtype)
+        else:
+            self.min = np.full(self.channels, np.inf)
+            self.max = np.full(self.channels, -np.inf)
+        self.mean = np.zeros(self.channels)
+        m2 = np.zeros(self.channels)
+        check_finite = dtype.kind in 'fc'
+
+        for chunk in self._chunks():
+            for c in range(self.channels):
+                column = chunk[:, c]
+                if check_finite:
+                    finite = np.isfinite(column)
+                    if not finite.all():
+                        nan_count = int(np.isnan(column).sum())
+                        self.nan_count[c] += nan_count
+                        self.inf_count[c] += len(column) - int(finite.sum()) - nan_count
+                        column = column[finite]
+                if len(column) == 0:
+                    continue
+
+                # Merge this chunk's moments into the running ones (Chan et al.)
+                values = column.astype(np.float64)
+                n = len(values)
+                chunk_mean = values.sum() / n
+                values -= chunk_mean
+                chunk_m2 = values @ values
+                total = self.count[c] + n
+                delta = chunk_mean - self.mean[c]
+                self.mean[c] += delta * n / total
+                m2[c] += chunk_m2 + delta ** 2 * self.count[c] * n / total
+                self.count[c] = total
+                self.min[c] = min(self.min[c], column.min())
+                self.max[c] = max(self.max[c], column.max())
+
+        empty = self.count == 0
+        if empty.any():
+            # Integer extremes only become float where a channel has nothing to report
+            self.min, self.max = self.min.astype(np.float64), self.max.astype(np.float64)
+            self.min[empty] = np.nan
+            self.max[empty] = np.nan
+        self.mean[empty] = np.nan
+        self.std = np.sqrt(m2 / np.maximum(self.count, 1))
+        self.std[empty] = np.nan
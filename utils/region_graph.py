@@ -0,0 +1,66 @@
+import numpy as np
+
+GOLDEN_FRACTION = (5 ** 0.5 - 1) / 2
+STOP_CHECK_INTERVAL = 1024
+BAND_PIXELS = 1 << 22
+
+def region_adjacency(index, n, budget=None):
+    # Horizontally and vertically adjacent pixel pairs, one band of rows at a time; index holds 0..n-1, or -1 for no region
+    height, width = index.shape
+    rows = max(1, BAND_PIXELS // max(1, width))
+    keys, lengths = [], []
+
+    for start in range(0, height, rows):
+        if budget is not None:
+            budget.check()
+        # One row of overlap picks up the vertical pairs across the band boundary
+        band = index[start:start + rows + 1]
+        band_keys = []
+        for a, b in ((band[:rows, :-1], band[:rows, 1:]), (band[:-1], band[1:])):
+            boundary = (a != b) & (a >= 0) & (b >= 0)
+            a, b = a[boundary].astype(np.int64), b[boundary].astype(np.int64)
+            band_keys.append(np.minimum(a, b) * n + np.maximum(a, b))
+        band_keys, band_lengths = np.unique(np.concatenate(band_keys), return_counts=True)
+        keys.append(band_keys)
+        lengths.append(band_lengths)
+
+    keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    boundary_lengths = np.bincount(inverse, weights=np.concatenate(lengths), minlength=len(keys)).astype(np.int64)
+    return keys // n, keys % n, boundary_lengths
+
+def assign_hue_slots(n, edges_i, edges_j, slots, budget=None):
+    # Greedy largest-degree-first colouring: each region takes the middle of the widest hue gap its coloured
+    # neighbours leave. Regions with no coloured neighbours step around the circle by the golden ratio
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(np.concatenate([edges_i, edges_j]), minlength=n), out=indptr[1:])
+    order = np.argsort(np.concatenate([edges_i, edges_j]), kind='stable')
+    if budget is not None:
+        budget.check()
+    neighbors = np.concatenate([edges_j, edges_i])[order].tolist()
+    indptr = indptr.tolist()
+
+    assignment = [-1] * n
+    free_hue = 0.0
+    finished = True
+
+    for step, region in enumerate(np.argsort(-np.diff(indptr), kind='stable').tolist()):
+        if budget is not None and step % STOP_CHECK_INTERVAL == 0 and budget.should_stop():
+            finished = False
+            break
+        taken = sorted({assignment[v] for v in neighbors[indptr[region]:indptr[region + 1]]} - {-1})
+        if not taken:
+            assignment[region] = int(free_hue) % slots
+            free_hue += slots * GOLDEN_FRACTION
+            continue
+
+        start, gap = taken[-1], taken[0] + slots - taken[-1]
+        for low, high in zip(taken, taken[1:]):
+            if high - low > gap:
+                start, gap = low, high - low
+        assignment[region] = (start + gap // 2) % slots
+
+    assignment = np.array(assignment, dtype=np.int64)
+    if not finished:
+        unassigned = assignment < 0
+        assignment[unassigned] = (free_hue + np.arange(unassigned.sum()) * slots * GOLDEN_FRACTION).astype(np.int64) % slots
+    return assignment, finished
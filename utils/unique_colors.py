@@ -0,0 +1,86 @@
+import hashlib
+import numpy as np
+
+BINCOUNT_MAX_BITS = 24
+
+class UniqueColors:
+    def __init__(self, pixels):
+        pixels = np.asarray(pixels)
+        pixels = pixels.reshape(len(pixels), -1)
+        self.dtype = pixels.dtype
+        self.channels = pixels.shape[1]
+        self._inverse = None
+        self._keys = None
+        self._lut_bits = None
+        self._digest = None
+
+        if self.dtype.kind in 'uib' and self.dtype.itemsize * 8 * self.channels <= 64:
+            self._count_packed(pixels)
+        else:
+            self._count_rows(pixels)
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def inverse(self):
+        if self._inverse is None:
+            if self._lut_bits is not None:
+                lut = np.zeros(1 << self._lut_bits, dtype=np.int32)
+                lut[self._unique_keys] = np.arange(len(self._unique_keys))
+                self._inverse = lut[self._keys]
+            else:
+                self._inverse = np.searchsorted(self._unique_keys, self._keys)
+        return self._inverse
+
+    @property
+    def digest(self):
+        # Identifies the pixels themselves, from each one's packed key or else its index into values
+        if self._digest is None:
+            digest = hashlib.sha1(repr((self.dtype.str, self.channels, len(self.counts))).encode())
+            digest.update(np.ascontiguousarray(self.values))
+            digest.update(self.inverse if self._keys is None else self._keys)
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def _count_packed(self, pixels):
+        # Pack channel 0 into the most significant bits so key order matches np.unique's row order
+        self._bits = 8 if self.dtype.kind == 'b' else self.dtype.itemsize * 8
+        total_bits = self._bits * self.channels
+        key_dtype = np.uint32 if total_bits <= 32 else np.uint64
+        unsigned = pixels.view(np.uint8) if self.dtype.kind == 'b' else pixels.view(f'u{self.dtype.itemsize}')
+        self._sign = (1 << (self._bits - 1)) if self.dtype.kind == 'i' else 0
+
+        keys = np.zeros(len(pixels), dtype=key_dtype)
+        for c in range(self.channels):
+            keys <<= key_dtype(self._bits)
+            column = unsigned[:, c] ^ unsigned.dtype.type(self._sign) if self._sign else unsigned[:, c]
+            keys |= column
+        self._keys = keys
+
+        if total_bits <= BINCOUNT_MAX_BITS:
+            counts = np.bincount(keys, minlength=1 << total_bits)
+            self._unique_keys = np.flatnonzero(counts).astype(key_dtype)
+            self.counts = counts[self._unique_keys]
+            self._lut_bits = total_bits
+        else:
+            self._unique_keys, self.counts = np.unique(keys, return_counts=True)
+
+        self.values = self._unpack(self._unique_keys)
+
+    def _unpack(self, keys):
+        mask = (1 << self._bits) - 1
+        unsigned_dtype = np.uint8 if self.dtype.kind == 'b' else np.dtype(f'u{self.dtype.itemsize}')
+        values = np.empty((len(keys), self.channels), dtype=unsigned_dtype)
+        for c in range(self.channels):
+            shift = self._bits * (self.channels - 1 - c)
+            values[:, c] = ((keys >> keys.dtype.type(shift)) & keys.dtype.type(mask)) ^ self._sign
+        return values.view(self.dtype)
+
+    def _count_rows(self, pixels):
+        if self.channels == 1:
+            values, self._inverse, self.counts = np.unique(pixels[:, 0], return_inverse=True, return_counts=True)
+            self.values = values[:, None]
+        else:
+            self.values, self._inverse, self.counts = np.unique(pixels, axis=0, return_inverse=True, return_counts=True)
+        self._inverse = self._inverse.reshape(-1)
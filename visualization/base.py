@@ -1,17 +1,30 @@
 from abc import ABC, abstractmethod
+from core.cancellation import TimeBudget
 
 class VisualizationModule(ABC):
-    def __init__(self, image_container):
+    inputs = ()
+    
+    def __init__(self, image_container, budget=None):
         self.data_container = image_container
+        self.budget = budget or TimeBudget()
+    
+    def prepare(self):
+        # Runs on a worker thread; everything that does not touch Qt belongs here
+        return None
     
     @abstractmethod
-    def generate_visualizations(self):
+    def build(self, prepared):
         pass
     
     @abstractmethod
     def get_module_name(self):
         pass
     
+    @classmethod
+    def estimate_cost(cls, data_container):
+        # Rough seconds to prepare and build; modules over the budget wait for a click
+        return 0.0
+    
     @classmethod
     @abstractmethod
     def get_supported_containers(cls):
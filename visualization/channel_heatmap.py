@@ -1,27 +1,39 @@
 import numpy as np
 from visualization.base import VisualizationModule
 from gui.heatmap_widgets import create_heatmap_widget
-from utils.heatmap_utils import get_colormap_name
+from utils.heatmap_utils import get_colormap_name, apply_colormap_to_data
 
 class PerChannelHeatmapModule(VisualizationModule):
-    def generate_visualizations(self):
-        results = []
+    inputs = ('channel_planes', 'channel_minmax')
+    
+    def prepare(self):
+        channels = []
         
         for i, channel_name in enumerate(self.data_container.channel_names):
+            self.budget.check()
             channel = self.data_container.get_channel(i)
             colormap_name = get_colormap_name(channel_name)
-            
+            channels.append((channel_name, channel, colormap_name, apply_colormap_to_data(channel, colormap_name)))
+        
+        return channels
+    
+    def build(self, channels):
+        results = []
+        min_vals, max_vals = self.data_container.get_intermediate('channel_minmax')
+        
+        for i, (channel_name, channel, colormap_name, heatmap_rgb) in enumerate(channels):
             dual_axis = channel.dtype == np.uint16
             unit_converter = (lambda x: x / 1000.0) if dual_axis else None
             
             widget = create_heatmap_widget(
                 colormap_name=colormap_name,
-                min_val=np.min(channel),
-                max_val=np.max(channel),
+                min_val=min_vals[i],
+                max_val=max_vals[i],
                 original_channel_data=channel,
                 module_name=self.get_module_name(),
                 dual_axis=dual_axis,
-                unit_converter=unit_converter
+                unit_converter=unit_converter,
+                heatmap_rgb=heatmap_rgb
             )
             results.append((f"{channel_name} Heatmap", widget))
         
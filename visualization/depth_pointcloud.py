@@ -3,25 +3,35 @@ import numpy as np
 from visualization.base import VisualizationModule
 from gui.heatmap_widgets import create_vtk_heatmap_widget
 from utils.heatmap_utils import get_colormap_name, apply_colormap_to_data
-from utils.depth_projection import project_depth_to_pointcloud
 
 class DepthPointCloudModule(VisualizationModule):
-    def generate_visualizations(self):
-        results = []
+    inputs = ('projected_points',)
+    
+    def prepare(self):
+        clouds = []
+        projections = self.data_container.get_intermediate('projected_points')
         
         for i, channel_name in enumerate(self.data_container.channel_names):
-            channel = self.data_container.get_channel(i)
-            points, mask = project_depth_to_pointcloud(channel)
+            self.budget.check()
+            channel = self.data_container.get_channel_view(i)
+            points, mask = projections[i]
             if len(points) == 0:
                 raise ValueError(f"No valid points generated for channel {channel_name}")
             
             depth_values = channel[mask]
             colormap_name = get_colormap_name(channel_name)
-            
+            clouds.append((channel_name, points, depth_values, colormap_name, apply_colormap_to_data(depth_values, colormap_name)))
+        
+        return clouds
+    
+    def build(self, clouds):
+        results = []
+        
+        for channel_name, points, depth_values, colormap_name, colors in clouds:
             cloud = pv.PolyData(points)
-            cloud['colors'] = apply_colormap_to_data(depth_values, colormap_name)
+            cloud['colors'] = colors
             
-            is_uint16 = channel.dtype == np.uint16
+            is_uint16 = depth_values.dtype == np.uint16
             unit_converter = (lambda x: x / 1000.0) if is_uint16 else None
             
             widget = create_vtk_heatmap_widget(
@@ -39,6 +49,11 @@ class DepthPointCloudModule(VisualizationModule):
         
         return results
     
+    @classmethod
+    def estimate_cost(cls, data_container):
+        # Every nonzero pixel of every channel becomes a point, plus a VTK view per channel
+        return data_container.original.size * 5e-8 + 0.3 * data_container.channels
+    
     def get_module_name(self):
         return "Depth Point Clouds"
     
@@ -1,49 +1,164 @@
+import atexit
+import hashlib
+import threading
+import time
+import traceback
+from collections import OrderedDict
 import cv2
 import numpy as np
-import random
 from PyQt6.QtWidgets import QMenu
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
+from core.cancellation import CancellationToken, OperationCancelled, TimeBudget
+from core.settings import Settings
+from core.worker_pool import WorkerPool
 from visualization.base import VisualizationModule
 from gui.widget_utils import create_image_widget
+from utils.color_utils import endpoints_palette, seeded_permutations, uniform_palette
+
+SPATIAL_EXPONENT = 100
+# (1 - d) ** 100 falls below 1e-6 past this fraction of the diagonal; farther pairs are not measured
+SPATIAL_REACH = 1 - 1e-6 ** (1 / SPATIAL_EXPONENT)
+RESTART_BATCH_ELEMENTS = 1 << 22
+# Above this many labels the pairwise loss is replaced by colouring the region adjacency graph
+DENSE_LABELS = 500
+# Integer channels spanning at most this many values are indexed through a dense lookup table
+LUT_MAX_SPAN = 1 << 24
+
+# Refined colours reach the tile at most this often, in seconds
+REFRESH_INTERVAL = 0.25
+# Finished assignments per (label map digest, method), so reloads and method switches skip the search
+MEMO_ENTRIES = 64
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+# Workers running refinements, by their tokens; a daemon thread killed at exit inside OpenCV aborts the process
+_running = {}
+_running_lock = threading.Condition()
+_stopping = False
+# Refinements queue on the shared module workers behind the modules of the frame being shown
+REFINE_PRIORITY = 1
+# Longest the exit hook waits, in total, for cancelled refinements to return
+EXIT_WAIT = 5.0
+
+def _recall(key):
+    with _memo_lock:
+        colors = _memo.get(key)
+        if colors is not None:
+            _memo.move_to_end(key)
+        return colors
+
+def _remember(key, colors):
+    with _memo_lock:
+        _memo[key] = colors
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_ENTRIES:
+            _memo.popitem(last=False)
+
+def _stop_refinements():
+    global _stopping
+    deadline = time.perf_counter() + EXIT_WAIT
+    with _running_lock:
+        # Refinements still queued never start, and those running unwind together under one deadline
+        _stopping = True
+        for tokens in _running.values():
+            for token in tokens:
+                token.cancel()
+        while _running:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            _running_lock.wait(remaining)
+
+atexit.register(_stop_refinements)
+
+class RefinementSignals(QObject):
+    improved = pyqtSignal(int, object, object)
 
 class GoldenRatioHSVModule(VisualizationModule):
-    def __init__(self, image_container):
-        super().__init__(image_container)
+    inputs = ('unique_colors', 'channel_unique')
+    
+    def __init__(self, image_container, budget=None):
+        super().__init__(image_container, budget)
         self.method = "endpoints"
+        self.partial = False
+        self.views = []
+        self.widgets = []
+        self.refinements = []
+        self.signals = None
     
-    def generate_visualizations(self):
-        results = []
+    def prepare(self):
+        views = []
+        
+        channel_unique = self.data_container.get_intermediate('channel_unique')
+        max_labels = self.max_labels()
         
         if self.data_container.channels == 1:
-            unique_vals = np.unique(self.data_container.original)
-            if len(unique_vals) <= 500:
-                image = self._map_channel(self.data_container.original, unique_vals)
-                widget = create_image_widget(image, self.get_module_name())
-                self._add_right_click_menu(widget, lambda: self._map_channel(self.data_container.original, unique_vals))
-                results.append(("Golden Ratio HSV", widget))
+            unique_vals = channel_unique[0]
+            if len(unique_vals) <= max_labels:
+                label_map = self._label_map(self.data_container.original, unique_vals)
+                views.append(self._prepare_view("Golden Ratio HSV", label_map, len(unique_vals), 0))
         else:
-            max_channel_unique = max(len(np.unique(self.data_container.get_channel(i))) for i in range(self.data_container.channels))
-            if max_channel_unique <= 100:
+            if max(len(unique_vals) for unique_vals in channel_unique) <= max_labels:
                 for i, name in enumerate(self.data_container.channel_names):
-                    channel = self.data_container.get_channel(i)
-                    unique_vals = np.unique(channel)
-                    image = self._map_channel(channel, unique_vals)
-                    widget = create_image_widget(image, self.get_module_name())
-                    self._add_right_click_menu(widget, lambda ch=channel, uv=unique_vals: self._map_channel(ch, uv))
-                    results.append((f"{name} Golden Ratio HSV", widget))
+                    self.budget.check()
+                    label_map = self._label_map(self.data_container.get_channel(i), channel_unique[i])
+                    views.append(self._prepare_view(f"{name} Golden Ratio HSV", label_map, len(channel_unique[i]), i))
             
-            reshaped = self.data_container.original.reshape(-1, self.data_container.channels)
-            unique_colors, indices = np.unique(reshaped, axis=0, return_inverse=True)
-            if len(unique_colors) <= 500:
-                colors = self._generate_colors(len(unique_colors), indices.reshape(self.data_container.original.shape[:2]))
-                image = colors[indices].reshape(*self.data_container.original.shape[:2], 3)
-                widget = create_image_widget(image, self.get_module_name())
-                self._add_right_click_menu(widget, lambda: self._generate_colors(len(unique_colors), indices.reshape(self.data_container.original.shape[:2]))[indices].reshape(*self.data_container.original.shape[:2], 3))
-                results.append(("Global Golden Ratio HSV", widget))
+            unique = self.data_container.get_intermediate('unique_colors')
+            if len(unique) <= max_labels:
+                label_map = unique.inverse.reshape(self.data_container.original.shape[:2])
+                views.append(self._prepare_view("Global Golden Ratio HSV", label_map, len(unique), 'global'))
         
+        return views
+    
+    @staticmethod
+    def max_labels():
+        return Settings().get('golden_ratio_max_labels', 100000)
+    
+    def _prepare_view(self, title, label_map, count, view):
+        # Every view is a function of the image, which unique_colors hashes once for all of them
+        source = self.data_container.get_intermediate('unique_colors').digest
+        digest = hashlib.sha1(repr((source, view, label_map.shape, count)).encode()).hexdigest()
+        
+        # Small maps start from the unoptimised palette and are refined once their tile is up
+        colors = _recall((digest, self.method))
+        deferred = colors is None and count <= DENSE_LABELS
+        if colors is None:
+            self.partial = False
+            colors = self._generate_colors(count, label_map, optimize=not deferred)
+            if self.partial:
+                # A graph colouring cut short carries on in the background, like the pairwise search
+                deferred = True
+            elif not deferred:
+                _remember((digest, self.method), colors)
+        return (title, colors[label_map], label_map, count, digest, deferred)
+    
+    def build(self, views):
+        results = []
+        self.signals = RefinementSignals()
+        self.signals.improved.connect(self._show_refined)
+        
+        deferred = []
+        for index, (title, image, label_map, count, digest, pending) in enumerate(views):
+            if pending:
+                # Prepared outputs are reused across visits, so a search finished since may already be memoized
+                colors = _recall((digest, self.method))
+                if colors is None:
+                    deferred.append(index)
+                else:
+                    image = colors[label_map]
+            widget = create_image_widget(image, self.get_module_name())
+            self._add_right_click_menu(widget, index)
+            widget.destroyed.connect(lambda _=None, index=index: self._cancel_refinement(index))
+            self.views.append((label_map, count, digest))
+            self.widgets.append(widget)
+            self.refinements.append(None)
+            results.append((title, widget))
+        
+        if deferred:
+            self._refine(deferred, self.method, self.budget.token)
         return results
     
-    def _add_right_click_menu(self, widget, regenerate_func):
+    def _add_right_click_menu(self, widget, index):
         original_mouse_press = getattr(widget, 'mousePressEvent', lambda e: None)
         
         def mouse_press_event(event):
@@ -56,8 +171,8 @@ class GoldenRatioHSVModule(VisualizationModule):
                 endpoints_action = menu.addAction("Endpoints Method")
                 uniform_action = menu.addAction("Uniform Method")
                 
-                endpoints_action.triggered.connect(lambda: self._change_method("endpoints", widget, regenerate_func))
-                uniform_action.triggered.connect(lambda: self._change_method("uniform", widget, regenerate_func))
+                endpoints_action.triggered.connect(lambda: self._change_method("endpoints", index))
+                uniform_action.triggered.connect(lambda: self._change_method("uniform", index))
                 
                 menu.exec(event.globalPos())
             else:
@@ -65,45 +180,153 @@ class GoldenRatioHSVModule(VisualizationModule):
         
         widget.mousePressEvent = mouse_press_event
     
-    def _change_method(self, new_method, widget, regenerate_func):
+    def _change_method(self, new_method, index):
         self.method = new_method
-        new_image = regenerate_func()
+        label_map, count, digest = self.views[index]
+        self._cancel_refinement(index)
+        
+        colors = _recall((digest, new_method))
+        if colors is not None:
+            self._show_image(index, colors[label_map])
+            return
+        if count <= DENSE_LABELS:
+            self._show_image(index, self._generate_colors(count, label_map, optimize=False)[label_map])
+        # The run that created the widget may be long gone, so this search is not tied to its token
+        self._refine([index], new_method)
+    
+    def _refine(self, indices, method, parent=None):
+        jobs = []
+        for index in indices:
+            self._cancel_refinement(index)
+            self.refinements[index] = CancellationToken(parent)
+            jobs.append((index, self.refinements[index]))
+        WorkerPool.get_pool().submit(self._run_refinements, jobs, method, priority=REFINE_PRIORITY)
+    
+    def _cancel_refinement(self, index):
+        if self.refinements[index] is not None:
+            self.refinements[index].cancel()
+            self.refinements[index] = None
+    
+    def _run_refinements(self, jobs, method):
+        thread = threading.current_thread()
+        with _running_lock:
+            if _stopping:
+                return
+            _running[thread] = [token for _, token in jobs]
+        try:
+            for index, token in jobs:
+                if token.cancelled:
+                    continue
+                try:
+                    self._refine_view(index, token, method)
+                except OperationCancelled:
+                    pass
+                except Exception:
+                    # A pool worker must outlive a failed search; the tile keeps the colours it shows
+                    traceback.print_exc()
+        finally:
+            with _running_lock:
+                _running.pop(thread, None)
+                _running_lock.notify_all()
+    
+    def _refine_view(self, index, token, method):
+        label_map, count, digest = self.views[index]
+        # A module of its own keeps this search's deadline and partial flag apart from the other views.
+        # The greedy graph colouring has a fixed amount of work, so in the background it runs to the end
+        seconds = None if count > DENSE_LABELS else self.budget.seconds
+        refiner = GoldenRatioHSVModule(self.data_container, TimeBudget(seconds, token))
+        refiner.method = method
+        shown = time.perf_counter()
+        
+        def improved(colors):
+            nonlocal shown
+            if time.perf_counter() - shown >= REFRESH_INTERVAL:
+                shown = time.perf_counter()
+                self.signals.improved.emit(index, token, colors[label_map])
+        
+        colors = refiner._generate_colors(count, label_map, improved=improved)
+        if not refiner.partial:
+            _remember((digest, method), colors)
+        self.signals.improved.emit(index, token, colors[label_map])
+    
+    def _show_refined(self, index, token, image):
+        # Updates from a search that was cancelled or replaced since are dropped
+        if self.refinements[index] is token and not token.cancelled:
+            self._show_image(index, image)
+    
+    def _show_image(self, index, image):
         from gui.widget_utils import _create_label_from_cv2
-        new_label = _create_label_from_cv2(new_image)
-        widget.setPixmap(new_label.pixmap())
-    
-    def _map_channel(self, channel, unique_vals):
-        colors = self._generate_colors(len(unique_vals), channel)
-        if channel.dtype == np.uint8:
-            color_map = np.zeros((256, 3), dtype=np.uint8)
-            color_map[unique_vals] = colors
-            return color_map[channel]
-        
-        output = np.zeros((*channel.shape, 3), dtype=np.uint8)
-        for i, val in enumerate(unique_vals):
-            output[channel == val] = colors[i]
-        return output
-    
-    def _generate_colors(self, count, labeled_image):
+        self.widgets[index].setPixmap(_create_label_from_cv2(image).pixmap())
+    
+    def _label_map(self, channel, unique_vals):
+        # Each pixel's position in unique_vals, built once so that regenerating only re-indexes a palette
+        count = len(unique_vals)
+        index_dtype = np.uint8 if count <= 1 << 8 else np.uint16 if count <= 1 << 16 else np.int32
+        if channel.dtype.kind in 'bui':
+            # Unsigned values index the table directly; signed ones are shifted by the smallest value
+            low = int(unique_vals[0]) if channel.dtype.kind == 'i' else 0
+            high = int(unique_vals[-1])
+            if high - low < LUT_MAX_SPAN:
+                lut = np.zeros(high - low + 1, dtype=index_dtype)
+                lut[unique_vals.astype(np.int64) - low] = np.arange(count)
+                if channel.dtype.kind == 'b':
+                    return lut[channel.view(np.uint8)]
+                return lut[channel.astype(np.int64) - low] if low else lut[channel]
+        return np.searchsorted(unique_vals, channel).astype(index_dtype)
+    
+    def _generate_colors(self, count, labeled_image, optimize=True, improved=None):
         if self.method == "uniform":
-            return self._generate_colors_uniform(count, labeled_image)
+            return self._generate_colors_uniform(count, labeled_image, optimize, improved)
         else:
-            return self._generate_colors_endpoints(count, labeled_image)
+            return self._generate_colors_endpoints(count, labeled_image, optimize, improved)
     
     def _compute_normed_spatial_distances(self, labeled_image, labels):
         n = len(labels)
-        distances = np.zeros((n, n))
-        max_spatial_dist = np.linalg.norm(labeled_image.shape[:2])
+        height, width = labeled_image.shape[:2]
+        max_spatial_dist = np.linalg.norm((height, width))
+        reach = int(np.ceil(SPATIAL_REACH * max_spatial_dist))
+        # Pairs not measured, being out of reach or past the deadline, count as far apart and drop out of the loss
+        distances = np.full((n, n), max_spatial_dist, dtype=np.float32)
+        
+        index = self._label_index(labeled_image, labels)
+        boxes = self._label_boxes(index, n)
         
         for i in range(n):
-            mask_i = (labeled_image == labels[i]).astype(np.uint8)
-            dist_transform = cv2.distanceTransform(1 - mask_i, cv2.DIST_L2, 3)
-            
-            for j in range(i + 1, n):
-                mask_j = labeled_image == labels[j]
-                distances[i, j] = distances[j, i] = np.min(dist_transform[mask_j])
+            if self.budget.should_stop():
+                self.partial = True
+                break
+            y0, y1, x0, x1 = boxes[i]
+            if y0 > y1:
+                continue
+            # Only the neighbourhood this label can reach needs a distance transform
+            y0, x0 = max(0, y0 - reach), max(0, x0 - reach)
+            y1, x1 = min(height, y1 + reach + 1), min(width, x1 + reach + 1)
+            roi = index[y0:y1, x0:x1]
+            dist_transform = cv2.distanceTransform((roi != i).astype(np.uint8), cv2.DIST_L2, 3)
+            near = (roi >= 0) & (dist_transform <= reach)
+            np.minimum.at(distances[i], roi[near], dist_transform[near])
         
-        return distances / max_spatial_dist
+        return np.minimum(distances, distances.T) / max_spatial_dist
+    
+    def _label_index(self, labeled_image, labels):
+        # Position of each pixel's value in labels, or -1 where it is not one of them
+        if labeled_image.dtype.kind in 'ui' and len(labels) and labels[-1] - labels[0] == len(labels) - 1:
+            index = labeled_image.astype(np.int32) - np.int32(labels[0])
+            return np.where((index >= 0) & (index < len(labels)), index, -1)
+        index = np.searchsorted(labels, labeled_image).clip(0, len(labels) - 1)
+        return np.where(labels[index] == labeled_image, index, -1).astype(np.int32)
+    
+    def _label_boxes(self, index, n):
+        ys, xs = np.nonzero(index >= 0)
+        ids = index[ys, xs]
+        boxes = np.empty((n, 4), dtype=np.int64)
+        boxes[:, [0, 2]] = np.iinfo(np.int64).max
+        boxes[:, [1, 3]] = -1
+        np.minimum.at(boxes[:, 0], ids, ys)
+        np.maximum.at(boxes[:, 1], ids, ys)
+        np.minimum.at(boxes[:, 2], ids, xs)
+        np.maximum.at(boxes[:, 3], ids, xs)
+        return boxes
     
     def _compute_normed_color_distances(self, colors):
         colors_hsv = cv2.cvtColor(colors.reshape(1, -1, 3), cv2.COLOR_RGB2HSV)[0]
@@ -112,88 +335,140 @@ class GoldenRatioHSVModule(VisualizationModule):
         hue_color_distance = np.minimum(np.abs(hue_diff), 180 - np.abs(hue_diff))
         return hue_color_distance / 90
     
-    def _optimize_assignment(self, base_colors, labeled_image, labels, n_iterations=100):
+    def _optimize_assignment(self, base_colors, labeled_image, labels, improved=None, n_iterations=100):
+        # improved, if given, is called with the colours whenever a better assignment is found
+        if len(labels) > DENSE_LABELS:
+            return self._color_adjacency_graph(base_colors, labeled_image, labels)
+        
         spatial_dist = self._compute_normed_spatial_distances(labeled_image, labels)
         color_dist = self._compute_normed_color_distances(base_colors)
         n_labels = len(labels)
         
-        def total_loss(assignment):
-            return sum((1 - spatial_dist[i,j])**100 * (1 - color_dist[assignment[i], assignment[j]])**2 
-                    for i in range(n_labels) for j in range(i+1, n_labels))
+        # loss = sum over label pairs of weights[i, j] * clash[color_i, color_j]
+        weights = (1 - spatial_dist.astype(np.float64)) ** SPATIAL_EXPONENT
+        np.fill_diagonal(weights, 0)
+        clash = (1 - color_dist) ** 2
         
-        best_assignment = list(range(n_labels))
-        best_loss = total_loss(best_assignment)
+        # Out-of-reach pairs have zero weight, so only nearby pairs are ever scored
+        pairs_i, pairs_j = np.nonzero(np.triu(weights))
+        pair_weights = weights[pairs_i, pairs_j]
+        neighbors = [np.flatnonzero(row) for row in weights]
         
-        for _ in range(n_iterations):
-            assignment = list(range(n_labels))
-            random.shuffle(assignment)
-            loss = total_loss(assignment)
-            if loss < best_loss:
-                best_loss = loss
-                best_assignment = assignment
+        # Random restarts, scored a batch of permutations at a time; row 0 is the identity
+        candidates = seeded_permutations(n_labels, n_iterations)
+        batch = max(1, RESTART_BATCH_ELEMENTS // max(1, len(pair_weights)))
+        best_assignment, best_loss = candidates[0], np.inf
         
-        def blob_loss(blob_idx, assignment):
-            return sum((1 - spatial_dist[blob_idx, j])**100 * (1 - color_dist[assignment[blob_idx], assignment[j]])**2 
-                    for j in range(n_labels) if j != blob_idx)
+        for start in range(0, len(candidates), batch):
+            if start and self.budget.should_stop():
+                self.partial = True
+                break
+            chunk = candidates[start:start + batch]
+            losses = clash[chunk[:, pairs_i], chunk[:, pairs_j]] @ pair_weights
+            best = int(np.argmin(losses))
+            if losses[best] < best_loss:
+                best_assignment, best_loss = chunk[best], losses[best]
+        if improved is not None:
+            improved(base_colors[best_assignment])
+        
+        # Local search: recolor the worst blobs first. candidate_loss[i, c] is blob i's share of the loss
+        # if it took color c; a move changes only its neighbours' rows instead of re-summing every pair
+        assignment = best_assignment.copy()
+        candidate_loss = weights @ clash[assignment]
+        blobs = np.arange(n_labels)
         
         for _ in range(500):
-            improved = False
+            moved = False
+            blob_loss = candidate_loss[blobs, assignment]
+            unvisited = blob_loss.copy()
             
             for _ in range(n_labels):
-                blob_losses = [(blob_loss(i, best_assignment), i) for i in range(n_labels)]
-                if not blob_losses:
-                    break
-                _, blob_idx = max(blob_losses)
-                current_loss = total_loss(best_assignment)
-                best_color = best_assignment[blob_idx]
-                
-                for color_idx in range(len(base_colors)):
-                    if color_idx != best_assignment[blob_idx]:
-                        test_assignment = best_assignment[:]
-                        test_assignment[blob_idx] = color_idx
-                        test_loss = total_loss(test_assignment)
-                        if test_loss < current_loss:
-                            current_loss = test_loss
-                            best_color = color_idx
+                if self.budget.should_stop():
+                    # The assignment only ever improves, so whatever we hold now is the best so far
+                    self.partial = True
+                    return base_colors[assignment]
+                blob_idx = int(np.argmax(unvisited))
+                unvisited[blob_idx] = -np.inf
                 
-                if best_color != best_assignment[blob_idx]:
-                    best_assignment[blob_idx] = best_color
-                    improved = True
+                best_color = int(np.argmin(candidate_loss[blob_idx]))
+                if candidate_loss[blob_idx, best_color] < blob_loss[blob_idx] - 1e-12:
+                    old_color = assignment[blob_idx]
+                    assignment[blob_idx] = best_color
+                    near = neighbors[blob_idx]
+                    candidate_loss[near] += np.outer(weights[blob_idx, near], clash[best_color] - clash[old_color])
+                    blob_loss[near] = candidate_loss[near, assignment[near]]
+                    blob_loss[blob_idx] = candidate_loss[blob_idx, best_color]
+                    unvisited[near] = np.where(np.isinf(unvisited[near]), -np.inf, blob_loss[near])
+                    moved = True
             
-            if not improved:
+            if not moved:
                 break
+            if improved is not None:
+                improved(base_colors[assignment])
         
-        return base_colors[best_assignment]
+        return base_colors[assignment]
     
-    def _generate_uniform_colors(self, count):
-        """Generate count uniform colors using golden ratio spacing"""
-        hues = np.linspace(0, 180, count+1)[:-1]
-        hsv = np.stack([hues, np.full(count, 255), np.full(count, 255)], axis=-1).astype(np.uint8)
-        return cv2.cvtColor(hsv.reshape(-1, 1, 3), cv2.COLOR_HSV2RGB).reshape(-1, 3)
-
-    def _generate_colors_uniform(self, count, labeled_image):
-        colors = self._generate_uniform_colors(count)
-        labels = np.unique(labeled_image)
-        return self._optimize_assignment(colors, labeled_image, labels)
+    def _color_adjacency_graph(self, base_colors, labeled_image, labels):
+        from utils.region_graph import region_adjacency, assign_hue_slots
+        # Labels outnumber the distinct 8-bit hues, so colours repeat; touching regions get well separated hues
+        hues = cv2.cvtColor(base_colors.reshape(1, -1, 3), cv2.COLOR_RGB2HSV)[0, :, 0]
+        _, first = np.unique(hues, return_index=True)
+        palette = base_colors[first]
+        
+        edges_i, edges_j, _ = region_adjacency(self._label_index(labeled_image, labels), len(labels), self.budget)
+        slots, finished = assign_hue_slots(len(labels), edges_i, edges_j, len(palette), self.budget)
+        if not finished:
+            self.partial = True
+        return palette[slots]
+    
+    def _generate_colors_uniform(self, count, labeled_image, optimize=True, improved=None):
+        colors = uniform_palette(count)
+        if not optimize:
+            return colors
+        return self._optimize_assignment(colors, labeled_image, np.arange(count), improved)
 
-    def _generate_colors_endpoints(self, count, labeled_image):
-        if count == 1:
-            return np.array([[128, 128, 128]], dtype=np.uint8)
+    def _generate_colors_endpoints(self, count, labeled_image, optimize=True, improved=None):
+        colors = endpoints_palette(count)
         
-        labels = np.unique(labeled_image)
-        labels = labels[labels >= 0][:count]
+        if count > 2 and optimize:
+            middle_labels = np.arange(1, count - 1)
+            report = None if improved is None else lambda middle: improved(np.vstack([colors[:1], middle, colors[-1:]]))
+            colors[1:-1] = self._optimize_assignment(colors[1:-1], labeled_image, middle_labels, report)
         
-        colors = np.zeros((count, 3), dtype=np.uint8)
-        colors[0] = (0, 0, 0) 
-        colors[-1] = (255, 255, 255)
+        return colors
+    
+    @classmethod
+    def estimate_cost(cls, data_container):
+        pixels = data_container.original.shape[0] * data_container.original.shape[1]
+        colors, channel_counts = data_container.estimate_unique_counts()
+        cost = 0.0 if data_container.has_intermediate('unique_colors') else data_container.original.size * 1e-8
         
-        if count > 2:
-            middle_colors = self._generate_uniform_colors(count - 2)
-            middle_labels = labels[1:-1]
-            optimized_middle = self._optimize_assignment(middle_colors, labeled_image, middle_labels)
-            colors[1:-1] = optimized_middle
+        max_labels = cls.max_labels()
+        if data_container.channels == 1:
+            label_counts = [colors] if colors <= max_labels else []
+        else:
+            label_counts = channel_counts if max(channel_counts) <= max_labels else []
+        # Channel maps need a lookup pass each; the global map reuses unique_colors.inverse
+        cost += len(label_counts) * pixels * 1e-8
+        maps = list(enumerate(label_counts))
+        if data_container.channels > 1 and colors <= max_labels:
+            maps.append((None, colors))
+        if maps:
+            # One hash of the image's packed colors keys the memo for every view
+            cost += pixels * 5e-9
         
-        return colors
+        if any(labels > DENSE_LABELS for _, labels in maps):
+            global_boundaries, channel_boundaries = data_container.estimate_boundaries()
+        for channel, labels in maps:
+            if labels > DENSE_LABELS:
+                # The adjacency pass grows with touching pixel pairs and the greedy walk with distinct
+                # touching label pairs, which noise makes far more numerous than the labels themselves
+                pairs, edges = global_boundaries if channel is None else channel_boundaries[channel]
+                cost += pixels * 3e-8 + pairs * 4e-8 + edges * 3.5e-7 + labels * 2e-6
+            else:
+                # The pairwise search is refined in the background after the tile is shown
+                cost += pixels * 1e-8
+        return cost
     
     def get_module_name(self):
         return "Golden Ratio HSV"
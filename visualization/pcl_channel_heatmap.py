@@ -5,18 +5,29 @@ from gui.heatmap_widgets import create_vtk_heatmap_widget
 from utils.heatmap_utils import get_colormap_name, apply_colormap_to_data
 
 class PCLChannelHeatmapModule(VisualizationModule):
-    def generate_visualizations(self):
-        results = []
+    inputs = ('channel_minmax',)
+    
+    def prepare(self):
+        channels = []
         
         if not self.data_container.has_colors:
-            return results
+            return channels, None
         
         for i, channel_name in enumerate(self.data_container.channel_names):
+            self.budget.check()
             channel = self.data_container.get_color_channel(i)
             colormap_name = get_colormap_name(channel_name)
-            
+            channels.append((channel_name, channel, colormap_name, apply_colormap_to_data(channel, colormap_name)))
+        
+        return channels, self.data_container.get_intermediate('channel_minmax')
+    
+    def build(self, prepared):
+        results = []
+        channels, minmax = prepared
+        
+        for i, (channel_name, channel, colormap_name, colors) in enumerate(channels):
             cloud = pv.PolyData(self.data_container.points)
-            cloud['colors'] = apply_colormap_to_data(channel, colormap_name)
+            cloud['colors'] = colors
             
             dual_axis = channel.dtype == np.uint16
             unit_converter = (lambda x: x / 1000.0) if dual_axis else None
@@ -26,8 +37,8 @@ class PCLChannelHeatmapModule(VisualizationModule):
                 container=self.data_container, 
                 original_data=channel, 
                 module_name=self.get_module_name(),
-                min_val=np.min(channel), 
-                max_val=np.max(channel), 
+                min_val=minmax[0][i], 
+                max_val=minmax[1][i], 
                 colormap_name=colormap_name, 
                 dual_axis=dual_axis, 
                 unit_converter=unit_converter
@@ -1,15 +1,18 @@
 import pyvista as pv
-import numpy as np
 from visualization.base import VisualizationModule
 from gui.widget_utils import create_qtinteractor
 
 class PCLRGBModule(VisualizationModule):
-    def generate_visualizations(self):
+    inputs = ('display_colors',)
+    
+    def prepare(self):
+        return self.data_container.get_intermediate('display_colors')
+    
+    def build(self, colors):
         cloud = pv.PolyData(self.data_container.points)
         
-        if self.data_container.has_colors:
-            colors = np.asarray(self.data_container.point_cloud.colors)
-            cloud['colors'] = (colors * 255).astype(np.uint8)
+        if colors is not None:
+            cloud['colors'] = colors
         
         widget = create_qtinteractor(cloud, self.data_container, module_name=self.get_module_name())
         return [("PCL RGB", widget)]
@@ -20,4 +23,4 @@ class PCLRGBModule(VisualizationModule):
     @classmethod
     def get_supported_containers(cls):
         from data_containers.pcl_container import PCLContainer
-        return [PCLContainer]
\ No newline at end of file
+        return [PCLContainer]